@@ -4,5 +4,6 @@ from agents.news_agent import NewsAgent
 from agents.technical_agent import TechnicalAgent
 from agents.fundamental_agent import FundamentalAgent
 from agents.risk_agent import RiskAgent
+from agents.orchestrator import analyze_all
 
-__all__ = ["NewsAgent", "TechnicalAgent", "FundamentalAgent", "RiskAgent"]
+__all__ = ["NewsAgent", "TechnicalAgent", "FundamentalAgent", "RiskAgent", "analyze_all"]
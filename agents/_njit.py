@@ -0,0 +1,29 @@
+"""Optional Numba JIT support for numeric agent kernels.
+
+Kernels are decorated with ``njit`` from this module. When numba is installed
+they are compiled to machine code (``cache=True`` keeps the compiled artifact
+on disk so restarts skip recompilation); otherwise ``njit`` is a no-op and the
+same Python code runs unchanged. Note that ``round(x, n)`` inside a compiled
+kernel scales and rounds in binary, so it can differ from Python's in the last
+requested digit.
+"""
+
+try:
+    from numba import njit
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for ``numba.njit`` (supports bare and called forms)."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+
+        return decorator
+
+
+__all__ = ["njit", "NUMBA_AVAILABLE"]
@@ -0,0 +1,23 @@
+"""Shared NumPy random generator for the agents' mock/rule-based data paths."""
+
+import threading
+
+import numpy as np
+
+_RNG_LOCAL = threading.local()
+
+
+def get_rng() -> np.random.Generator:
+    """
+    Get this thread's PCG64 generator, creating it on first use.
+
+    One generator per thread avoids contention on shared RNG state when
+    agents run concurrently (e.g. under asyncio.to_thread).
+
+    Returns:
+        numpy.random.Generator for the calling thread
+    """
+    rng = getattr(_RNG_LOCAL, "rng", None)
+    if rng is None:
+        rng = _RNG_LOCAL.rng = np.random.default_rng()
+    return rng
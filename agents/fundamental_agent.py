@@ -2,10 +2,124 @@
 
 import os
 import json
-from typing import Dict, Any
-from datetime import datetime
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, Any, List
+from types import MappingProxyType
+
+import httpx
+import numpy as np
+
+from agents._rng import get_rng
+from utils.gemini import get_async_client
+from utils.stream import get_writer
+from utils.timestamps import utc_isoformat
+
+
+# Column layout for mock economic data (shared by the scalar and batch paths)
+_METRICS = ("gdp_growth", "inflation", "interest_rate", "unemployment", "trade_balance", "debt_to_gdp")
+
+# Mock (low, high) ranges per currency for gdp_growth, inflation, interest_rate
+_MOCK_DATA_RANGES = MappingProxyType({
+    "EUR": ((1.0, 2.5), (2.0, 4.0), (3.5, 4.5)),
+    "USD": ((2.0, 3.5), (2.5, 4.5), (4.5, 5.5)),
+    "GBP": ((0.5, 2.0), (3.0, 5.0), (4.5, 5.5)),
+    "JPY": ((0.5, 1.5), (1.0, 3.0), (0.0, 0.5)),
+    "AUD": ((1.5, 3.0), (2.5, 4.5), (3.5, 4.5)),
+    "XAU": ((0.0, 0.0), (0.0, 0.0), (0.0, 0.0)),  # Commodity
+    "BTC": ((0.0, 0.0), (0.0, 0.0), (0.0, 0.0)),  # Crypto
+})
+_DEFAULT_DATA_RANGES = ((1.0, 3.0), (2.0, 4.0), (2.0, 5.0))
+
+# Ranges shared by every currency: unemployment, trade_balance, debt_to_gdp
+_COMMON_DATA_RANGES = ((3.5, 7.0), (-50, 50), (60, 120))
+
+_METRIC_DECIMALS = np.array([2, 2, 2, 1, 1, 1])
+_ROUND_SCALE = 10.0 ** _METRIC_DECIMALS
+
+# Lookup tables: one (low, high) row per known currency, default row last
+_CURRENCY_INDEX = MappingProxyType({currency: i for i, currency in enumerate(_MOCK_DATA_RANGES)})
+_DEFAULT_ROW = len(_CURRENCY_INDEX)
+_RANGE_TABLE = np.array(
+    [(*ranges, *_COMMON_DATA_RANGES) for ranges in (*_MOCK_DATA_RANGES.values(), _DEFAULT_DATA_RANGES)],
+    dtype=np.float64,
+)  # shape (currencies + 1, metrics, 2)
+_RANGE_LOW = _RANGE_TABLE[..., 0]
+_RANGE_HIGH = _RANGE_TABLE[..., 1]
+
+# Fundamental score weights, also the column order of comparison signs
+_WEIGHTS = (
+    ("gdp_growth", 0.25),
+    ("interest_rate", 0.35),
+    ("inflation", 0.25),
+    ("unemployment", 0.15),
+)
+_COMPARISON_METRICS = tuple(metric for metric, _ in _WEIGHTS)
+_WEIGHT_VEC = np.array([weight for _, weight in _WEIGHTS])
+_COMPARISON_LABELS = MappingProxyType({1: "base_stronger", -1: "quote_stronger", 0: "neutral"})
+
+
+@lru_cache(maxsize=512)
+def _get_outlook(score: float) -> str:
+    """Get outlook based on fundamental score (scores are rounded, so the key space is small)."""
+    if score > 0.3:
+        return "bullish"
+    elif score < -0.3:
+        return "bearish"
+    else:
+        return "neutral"
+
+
+def _split_pair(pair: str) -> tuple:
+    """
+    Split a "BASE/QUOTE" pair into its currencies.
+
+    Raises:
+        ValueError: If the pair is not in BASE/QUOTE form
+    """
+    parts = pair.split("/") if isinstance(pair, str) else ()
+    if len(parts) != 2 or not all(parts):
+        raise ValueError(f"Invalid currency pair: {pair!r} (expected BASE/QUOTE)")
+    return parts[0], parts[1]
+
+
+def _compare_fundamentals(base_data: Dict, quote_data: Dict) -> Dict[str, int]:
+    """
+    Compare fundamental metrics between currencies.
+
+    Returns:
+        Dict of metric -> sign (+1 base stronger, -1 quote stronger, 0 neutral)
+    """
+    b, q = base_data, quote_data
+
+    return {
+        # GDP Growth
+        "gdp_growth": (b["gdp_growth"] > q["gdp_growth"] * 1.1) - (q["gdp_growth"] > b["gdp_growth"] * 1.1),
+        # Interest Rate (higher is typically better for currency strength)
+        "interest_rate": (b["interest_rate"] > q["interest_rate"] + 0.5) - (q["interest_rate"] > b["interest_rate"] + 0.5),
+        # Inflation (lower is better)
+        "inflation": (b["inflation"] < q["inflation"] * 0.9) - (q["inflation"] < b["inflation"] * 0.9),
+        # Unemployment (lower is better)
+        "unemployment": (b["unemployment"] < q["unemployment"] * 0.9) - (q["unemployment"] < b["unemployment"] * 0.9),
+    }
+
+
+def _calculate_score(signs: Dict[str, int]) -> float:
+    """Calculate overall fundamental score from comparison signs."""
+    return round(sum(signs[metric] * weight for metric, weight in _WEIGHTS), 2)
 
 
+def _generate_summary(base: str, quote: str, outlook: str) -> str:
+    """Generate fundamental analysis summary for an already classified outlook."""
+    if outlook == "bullish":
+        return f"Fundamental analysis favors {base} over {quote}. Economic indicators suggest {base} strength."
+    elif outlook == "bearish":
+        return f"Fundamental analysis favors {quote} over {base}. Economic indicators suggest {quote} strength."
+    else:
+        return f"Fundamental analysis shows balanced conditions between {base} and {quote}."
+
+
+@dataclass(slots=True)
 class FundamentalAgent:
     """
     Performs fundamental economic analysis using Gemini LLM for intelligent reasoning.
@@ -21,11 +135,13 @@ class FundamentalAgent:
     3. Compare base vs quote currency fundamentals
     4. Generate trading outlook with reasoning
     5. Return structured JSON
+
+    Attributes:
+        use_llm: Whether to use Gemini (falls back to rule-based analysis)
     """
 
-    def __init__(self, use_llm: bool = True):
-        self.name = "FundamentalAgent"
-        self.use_llm = use_llm
+    use_llm: bool = True
+    name: str = field(default="FundamentalAgent", init=False)
 
     async def analyze(self, pair: str, config: dict = None) -> Dict[str, Any]:
         """
@@ -38,14 +154,25 @@ class FundamentalAgent:
         Returns:
             Dict with structured fundamental analysis results
         """
-        from langgraph.config import get_stream_writer
+        from google.genai import errors as genai_errors
         import time
 
         start_time = time.time()
 
+        # Validate input up front; everything below assumes a well-formed pair
+        try:
+            _split_pair(pair)
+        except ValueError as e:
+            return {
+                "success": False,
+                "agent": self.name,
+                "error": str(e),
+                "data": {},
+            }
+
         try:
             # Get stream writer for progress updates
-            writer = get_stream_writer()
+            writer = get_writer()
 
             # Emit progress: Starting analysis (10% progress)
             writer({"agent_progress": {
@@ -53,7 +180,7 @@ class FundamentalAgent:
                 "step": "initializing",
                 "message": f"Starting fundamental analysis for {pair}",
                 "progress_percentage": 10,
-                "execution_start_time": datetime.utcnow().isoformat() + "Z"
+                "execution_start_time": utc_isoformat() + "Z"
             }})
 
             if self.use_llm:
@@ -71,7 +198,8 @@ class FundamentalAgent:
                 # Fallback to rule-based analysis
                 return self._analyze_rule_based(pair, writer, start_time)
 
-        except Exception as e:
+        except (ValueError, KeyError, RuntimeError, genai_errors.APIError, httpx.HTTPError) as e:
+            # Missing API key / stream context, malformed LLM payload, Gemini API or transport failure
             print(f"  ⚠️  Fundamental Agent error: {str(e)}")
             return {
                 "success": False,
@@ -82,7 +210,6 @@ class FundamentalAgent:
 
     async def _analyze_with_llm(self, pair: str, writer, start_time: float) -> Dict[str, Any]:
         """Use Gemini LLM for intelligent fundamental analysis."""
-        from google import genai
         from google.genai import types
         import time
 
@@ -91,8 +218,8 @@ class FundamentalAgent:
         if not api_key:
             raise ValueError("GOOGLE_AI_API_KEY not found")
 
-        # Initialize Gemini
-        client = genai.Client(api_key=api_key)
+        # Reuse this event loop's Gemini client
+        client = get_async_client(api_key)
 
         # Build analysis prompt (50% progress)
         writer({"agent_progress": {
@@ -119,7 +246,7 @@ class FundamentalAgent:
             "progress_percentage": 60
         }})
 
-        response = client.models.generate_content(
+        response = await client.aio.models.generate_content(
             model="gemini-2.5-flash",
             contents=[prompt],
             config=config
@@ -174,7 +301,7 @@ class FundamentalAgent:
         }})
 
         elapsed = time.time() - start_time
-        execution_end_time = datetime.utcnow().isoformat() + "Z"
+        execution_end_time = utc_isoformat() + "Z"
 
         # Emit completion (100% progress)
         writer({"agent_progress": {
@@ -206,7 +333,7 @@ class FundamentalAgent:
                 "key_factors": analysis.get("key_factors", []),
                 "central_bank_policy": analysis.get("central_bank_policy", {}),
                 # Metadata
-                "analysis_timestamp": datetime.utcnow().isoformat(),
+                "analysis_timestamp": utc_isoformat(),
                 "summary": analysis.get("summary", ""),
                 "data_source": "llm_analysis",
                 # Execution timing
@@ -218,207 +345,197 @@ class FundamentalAgent:
 
     def _analyze_rule_based(self, pair: str, writer, start_time: float) -> Dict[str, Any]:
         """Fallback rule-based analysis (original logic)."""
-        import random
         import time
 
-        try:
-            # Extract currencies (50% progress)
-            writer({"agent_progress": {
-                "agent": "fundamental",
-                "step": "extracting_currencies",
-                "message": "Extracting currency information",
-                "progress_percentage": 50
-            }})
+        # Extract currencies (50% progress)
+        writer({"agent_progress": {
+            "agent": "fundamental",
+            "step": "extracting_currencies",
+            "message": "Extracting currency information",
+            "progress_percentage": 50
+        }})
 
-            base, quote = pair.split("/")
+        base, quote = _split_pair(pair)
 
-            # Get mock economic data (70% progress)
-            writer({"agent_progress": {
-                "agent": "fundamental",
-                "step": "fetching_data",
-                "message": f"Fetching economic data for {base} and {quote}",
-                "progress_percentage": 70
-            }})
+        # Get mock economic data (70% progress)
+        writer({"agent_progress": {
+            "agent": "fundamental",
+            "step": "fetching_data",
+            "message": f"Fetching economic data for {base} and {quote}",
+            "progress_percentage": 70
+        }})
 
-            base_data = self._get_mock_economic_data(base)
-            quote_data = self._get_mock_economic_data(quote)
+        base_data = self._get_mock_economic_data(base)
+        quote_data = self._get_mock_economic_data(quote)
 
-            # Compare fundamentals
-            comparison = self._compare_fundamentals(base_data, quote_data)
+        # Compare fundamentals
+        signs = _compare_fundamentals(base_data, quote_data)
+        comparison = {metric: _COMPARISON_LABELS[sign] for metric, sign in signs.items()}
 
-            # Calculate fundamental score
-            fundamental_score = self._calculate_score(comparison)
-            outlook = self._get_outlook(fundamental_score)
+        # Calculate fundamental score
+        fundamental_score = _calculate_score(signs)
+        outlook = _get_outlook(fundamental_score)
 
-            # Emit intermediate data (90% progress)
-            writer({"agent_progress": {
-                "agent": "fundamental",
-                "step": "analysis_complete",
-                "message": f"Outlook: {outlook} (score: {fundamental_score:+.2f})",
-                "progress_percentage": 90,
-                "intermediate_data": {
-                    "outlook": outlook,
-                    "fundamental_score": fundamental_score
-                }
-            }})
+        # Emit intermediate data (90% progress)
+        writer({"agent_progress": {
+            "agent": "fundamental",
+            "step": "analysis_complete",
+            "message": f"Outlook: {outlook} (score: {fundamental_score:+.2f})",
+            "progress_percentage": 90,
+            "intermediate_data": {
+                "outlook": outlook,
+                "fundamental_score": fundamental_score
+            }
+        }})
 
-            elapsed = time.time() - start_time
-            execution_end_time = datetime.utcnow().isoformat() + "Z"
+        elapsed = time.time() - start_time
+        execution_end_time = utc_isoformat() + "Z"
 
-            # Emit completion (100% progress)
-            writer({"agent_progress": {
-                "agent": "fundamental",
-                "step": "complete",
-                "message": f"Rule-based analysis complete in {elapsed:.2f}s",
-                "progress_percentage": 100,
-                "execution_end_time": execution_end_time,
-                "execution_time": elapsed
-            }})
+        # Emit completion (100% progress)
+        writer({"agent_progress": {
+            "agent": "fundamental",
+            "step": "complete",
+            "message": f"Rule-based analysis complete in {elapsed:.2f}s",
+            "progress_percentage": 100,
+            "execution_end_time": execution_end_time,
+            "execution_time": elapsed
+        }})
 
-            return {
+        return {
+            "success": True,
+            "agent": self.name,
+            "data": {
+                "pair": pair,
+                "base_currency": {
+                    "currency": base,
+                    "data": base_data,
+                },
+                "quote_currency": {
+                    "currency": quote,
+                    "data": quote_data,
+                },
+                "comparison": comparison,
+                "fundamental_score": fundamental_score,
+                "outlook": outlook,
+                "analysis_timestamp": utc_isoformat(),
+                "summary": _generate_summary(base, quote, outlook),
+                "data_source": "rule_based",
+                # Execution timing
+                "execution_time": elapsed,
+                "execution_start_time": start_time,
+                "execution_end_time": execution_end_time
+            },
+        }
+
+    def analyze_batch(self, pairs: List[str]) -> List[Dict[str, Any]]:
+        """
+        Rule-based fundamental analysis for many pairs at once.
+
+        Mock economic data for every base/quote currency is drawn in a single
+        vectorized call and comparisons/scores are computed with NumPy masks,
+        so portfolio-scale scans don't pay Python overhead per metric.
+
+        Args:
+            pairs: Currency pairs (e.g., ["EUR/USD", "GBP/JPY"])
+
+        Returns:
+            List of results in the same order and shape as the rule-based analysis
+        """
+        results: List[Dict[str, Any]] = [None] * len(pairs)
+
+        # Split pairs, recording malformed ones as errors
+        rows, bases, quotes = [], [], []
+        for i, pair in enumerate(pairs):
+            try:
+                base, quote = _split_pair(pair)
+            except ValueError as e:
+                results[i] = {"success": False, "agent": self.name, "error": str(e), "data": {}}
+                continue
+            rows.append(i)
+            bases.append(base)
+            quotes.append(quote)
+
+        n = len(rows)
+        if n == 0:
+            return results
+
+        # One draw for all base and quote currencies: rows [0, n) base, [n, 2n) quote
+        idx = np.fromiter(
+            (_CURRENCY_INDEX.get(c, _DEFAULT_ROW) for c in (*bases, *quotes)),
+            dtype=np.intp,
+            count=2 * n,
+        )
+        values = get_rng().uniform(_RANGE_LOW[idx], _RANGE_HIGH[idx])
+        values = np.rint(values * _ROUND_SCALE) / _ROUND_SCALE
+        base_arr, quote_arr = values[:n], values[n:]
+
+        # Comparison signs (+1 base stronger, -1 quote stronger, 0 neutral)
+        b_gdp, q_gdp = base_arr[:, 0], quote_arr[:, 0]
+        b_inf, q_inf = base_arr[:, 1], quote_arr[:, 1]
+        b_ir, q_ir = base_arr[:, 2], quote_arr[:, 2]
+        b_un, q_un = base_arr[:, 3], quote_arr[:, 3]
+        signs = np.stack(
+            [
+                (b_gdp > q_gdp * 1.1).astype(np.int8) - (q_gdp > b_gdp * 1.1),
+                (b_ir > q_ir + 0.5).astype(np.int8) - (q_ir > b_ir + 0.5),
+                (b_inf < q_inf * 0.9).astype(np.int8) - (q_inf < b_inf * 0.9),
+                (b_un < q_un * 0.9).astype(np.int8) - (q_un < b_un * 0.9),
+            ],
+            axis=1,
+        )
+
+        scores = np.round(signs @ _WEIGHT_VEC, 2)
+        outlooks = np.select([scores > 0.3, scores < -0.3], ["bullish", "bearish"], "neutral")
+
+        # One timestamp for the whole batch
+        timestamp = utc_isoformat()
+
+        for j, i in enumerate(rows):
+            base, quote = bases[j], quotes[j]
+            score = float(scores[j])
+            outlook = str(outlooks[j])
+            results[i] = {
                 "success": True,
                 "agent": self.name,
                 "data": {
-                    "pair": pair,
+                    "pair": pairs[i],
                     "base_currency": {
                         "currency": base,
-                        "data": base_data,
+                        "data": dict(zip(_METRICS, base_arr[j].tolist())),
                     },
                     "quote_currency": {
                         "currency": quote,
-                        "data": quote_data,
+                        "data": dict(zip(_METRICS, quote_arr[j].tolist())),
+                    },
+                    "comparison": {
+                        metric: _COMPARISON_LABELS[sign]
+                        for metric, sign in zip(_COMPARISON_METRICS, signs[j].tolist())
                     },
-                    "comparison": comparison,
-                    "fundamental_score": fundamental_score,
+                    "fundamental_score": score,
                     "outlook": outlook,
-                    "analysis_timestamp": datetime.utcnow().isoformat(),
-                    "summary": self._generate_summary(base, quote, fundamental_score),
+                    "analysis_timestamp": timestamp,
+                    "summary": _generate_summary(base, quote, outlook),
                     "data_source": "rule_based",
-                    # Execution timing
-                    "execution_time": elapsed,
-                    "execution_start_time": start_time,
-                    "execution_end_time": execution_end_time
                 },
             }
 
-        except Exception as e:
-            return {
-                "success": False,
-                "agent": self.name,
-                "error": str(e),
-                "data": {},
-            }
+        return results
 
     def _get_mock_economic_data(self, currency: str) -> Dict[str, Any]:
         """Get mock economic data for testing."""
-        import random
-
-        # Currency-specific base values (realistic ranges)
-        data_ranges = {
-            "EUR": {"gdp_growth": (1.0, 2.5), "inflation": (2.0, 4.0), "interest_rate": (3.5, 4.5)},
-            "USD": {"gdp_growth": (2.0, 3.5), "inflation": (2.5, 4.5), "interest_rate": (4.5, 5.5)},
-            "GBP": {"gdp_growth": (0.5, 2.0), "inflation": (3.0, 5.0), "interest_rate": (4.5, 5.5)},
-            "JPY": {"gdp_growth": (0.5, 1.5), "inflation": (1.0, 3.0), "interest_rate": (0.0, 0.5)},
-            "AUD": {"gdp_growth": (1.5, 3.0), "inflation": (2.5, 4.5), "interest_rate": (3.5, 4.5)},
-            "XAU": {"gdp_growth": (0.0, 0.0), "inflation": (0.0, 0.0), "interest_rate": (0.0, 0.0)},  # Commodity
-            "BTC": {"gdp_growth": (0.0, 0.0), "inflation": (0.0, 0.0), "interest_rate": (0.0, 0.0)},  # Crypto
-        }
+        row = _CURRENCY_INDEX.get(currency, _DEFAULT_ROW)
 
-        ranges = data_ranges.get(currency, {"gdp_growth": (1.0, 3.0), "inflation": (2.0, 4.0), "interest_rate": (2.0, 5.0)})
+        # Draw all metrics at once and round each column to its precision
+        values = get_rng().uniform(_RANGE_LOW[row], _RANGE_HIGH[row])
+        values = np.rint(values * _ROUND_SCALE) / _ROUND_SCALE
 
-        return {
-            "gdp_growth": round(random.uniform(*ranges["gdp_growth"]), 2),
-            "inflation": round(random.uniform(*ranges["inflation"]), 2),
-            "interest_rate": round(random.uniform(*ranges["interest_rate"]), 2),
-            "unemployment": round(random.uniform(3.5, 7.0), 1),
-            "trade_balance": round(random.uniform(-50, 50), 1),
-            "debt_to_gdp": round(random.uniform(60, 120), 1),
-        }
-
-    def _compare_fundamentals(self, base_data: Dict, quote_data: Dict) -> Dict[str, str]:
-        """Compare fundamental metrics between currencies."""
-        comparison = {}
-
-        # GDP Growth
-        if base_data["gdp_growth"] > quote_data["gdp_growth"] * 1.1:
-            comparison["gdp_growth"] = "base_stronger"
-        elif quote_data["gdp_growth"] > base_data["gdp_growth"] * 1.1:
-            comparison["gdp_growth"] = "quote_stronger"
-        else:
-            comparison["gdp_growth"] = "neutral"
-
-        # Interest Rate (higher is typically better for currency strength)
-        if base_data["interest_rate"] > quote_data["interest_rate"] + 0.5:
-            comparison["interest_rate"] = "base_stronger"
-        elif quote_data["interest_rate"] > base_data["interest_rate"] + 0.5:
-            comparison["interest_rate"] = "quote_stronger"
-        else:
-            comparison["interest_rate"] = "neutral"
-
-        # Inflation (lower is better)
-        if base_data["inflation"] < quote_data["inflation"] * 0.9:
-            comparison["inflation"] = "base_stronger"
-        elif quote_data["inflation"] < base_data["inflation"] * 0.9:
-            comparison["inflation"] = "quote_stronger"
-        else:
-            comparison["inflation"] = "neutral"
-
-        # Unemployment (lower is better)
-        if base_data["unemployment"] < quote_data["unemployment"] * 0.9:
-            comparison["unemployment"] = "base_stronger"
-        elif quote_data["unemployment"] < base_data["unemployment"] * 0.9:
-            comparison["unemployment"] = "quote_stronger"
-        else:
-            comparison["unemployment"] = "neutral"
-
-        return comparison
-
-    def _calculate_score(self, comparison: Dict[str, str]) -> float:
-        """Calculate overall fundamental score."""
-        weights = {
-            "gdp_growth": 0.25,
-            "interest_rate": 0.35,
-            "inflation": 0.25,
-            "unemployment": 0.15,
-        }
-
-        score = 0.0
-        for metric, weight in weights.items():
-            if comparison.get(metric) == "base_stronger":
-                score += weight
-            elif comparison.get(metric) == "quote_stronger":
-                score -= weight
-
-        return round(score, 2)
-
-    def _get_outlook(self, score: float) -> str:
-        """Get outlook based on fundamental score."""
-        if score > 0.3:
-            return "bullish"
-        elif score < -0.3:
-            return "bearish"
-        else:
-            return "neutral"
-
-    def _generate_summary(self, base: str, quote: str, score: float) -> str:
-        """Generate fundamental analysis summary."""
-        outlook = self._get_outlook(score)
-
-        if outlook == "bullish":
-            return f"Fundamental analysis favors {base} over {quote}. Economic indicators suggest {base} strength."
-        elif outlook == "bearish":
-            return f"Fundamental analysis favors {quote} over {base}. Economic indicators suggest {quote} strength."
-        else:
-            return f"Fundamental analysis shows balanced conditions between {base} and {quote}."
+        return dict(zip(_METRICS, values.tolist()))
 
     def _build_fundamental_prompt(self, pair: str) -> str:
         """Build the fundamental analysis prompt for Gemini."""
 
-        # Parse pair to identify base and quote
-        try:
-            base, quote = pair.split("/")
-        except:
-            base, quote = "EUR", "USD"
+        # Parse pair to identify base and quote (validated in analyze)
+        base, quote = _split_pair(pair)
 
         # Determine asset types
         commodities = ["XAU", "XAG", "XPT", "XPD"]
@@ -1,15 +1,128 @@
 """News Agent - Analyzes market news and sentiment using Google Search."""
 
 import os
-import json
+import copy
 import time
-from typing import Dict, Any
-from datetime import datetime
+import asyncio
+from typing import Dict, Any, List
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+import orjson
+from cachetools import TTLCache
+
+from utils.gemini import get_async_client
 from utils.logger import get_logger, log_error
+from utils.stream import get_writer
+from utils.timestamps import replay_result, utc_isoformat
 
 logger = get_logger(__name__)
 
+# News analysis prompt; filled with pair/base/quote via str.format
+_NEWS_PROMPT_TMPL = """You are a forex news analyst with real-time access to Google Search.
+
+TASK: Analyze current news and market sentiment for {pair} ({base}/{quote})
+
+Use Google Search to find:
+1. Recent news headlines (last 24-48 hours) about:
+   - "{pair} forex news"
+   - "{base} currency news"
+   - "{quote} currency news"
+   - "{base} central bank"
+   - "{base} economy"
+
+2. Major events affecting the currencies:
+   - Central bank decisions
+   - Economic data releases
+   - Geopolitical events
+   - Market sentiment shifts
+
+ANALYSIS REQUIREMENTS:
+
+1. **Headlines** (3-5 most relevant)
+   - Extract ACTUAL recent headlines from search results
+   - Include publication date/time if available
+   - Focus on market-moving news
+
+2. **Sentiment Analysis**
+   - Analyze overall market sentiment from headlines
+   - Score: -1.0 (very bearish) to +1.0 (very bullish)
+   - Consider: tone, events, analyst opinions
+
+3. **Impact Assessment**
+   - high: Major events (rate decisions, GDP, crises)
+   - medium: Notable events (inflation data, forecasts)
+   - low: Minor events (routine statements)
+
+4. **Key Events**
+   - List 2-3 most important recent events
+   - Include dates and brief descriptions
+
+OUTPUT FORMAT (JSON):
+{{
+  "headlines": [
+    {{
+      "title": "Actual headline from search results",
+      "date": "2025-11-05" (if available, else "recent"),
+      "sentiment": "bullish|bearish|neutral",
+      "source": "Publication name if available"
+    }}
+  ],
+  "sentiment_score": 0.0 to 1.0 or -1.0 to 0.0,
+  "sentiment": "bullish|bearish|neutral",
+  "impact": "high|medium|low",
+  "key_events": [
+    "Event 1: Description",
+    "Event 2: Description"
+  ],
+  "summary": "Brief summary of market sentiment and why (1-2 sentences)"
+}}
+
+CRITICAL:
+- Use ONLY information from Google Search results
+- Do NOT make up headlines or events
+- If no recent news found, indicate in summary
+- Be objective and fact-based
+- Sentiment must reflect actual market conditions
+
+Analyze now: {pair}
+"""
+
 
+# Successful analyses by (base, quote), so "EUR/USD", "EURUSD" and "eur/usd" share an entry.
+# Grounded news moves slowly enough that a few minutes of reuse is safe.
+_NEWS_CACHE_TTL = 300
+_NEWS_CACHE: TTLCache = TTLCache(maxsize=256, ttl=_NEWS_CACHE_TTL)
+
+
+@lru_cache(maxsize=1)
+def _news_config():
+    """Build the (static) Gemini config with Google Search grounding once."""
+    from google.genai import types
+
+    # Configure Google Search grounding
+    grounding_tool = types.Tool(google_search=types.GoogleSearch())
+
+    return types.GenerateContentConfig(
+        temperature=0.2,  # Low temperature for factual news analysis
+        # NOTE: Cannot use response_mime_type with tools
+        tools=[grounding_tool],
+        thinking_config=types.ThinkingConfig(thinking_budget=0),  # Speed over thinking
+    )
+
+
+def _parse_pair(pair: str) -> tuple:
+    """Parse trading pair into base and quote currencies."""
+    if "/" in pair:
+        base, quote = pair.split("/")
+    else:
+        # Assume format like "EURUSD"
+        base = pair[:3]
+        quote = pair[3:]
+    return base.upper(), quote.upper()
+
+
+@dataclass(slots=True)
 class NewsAgent:
     """
     Analyzes news and market sentiment for a currency pair using Google Search.
@@ -24,8 +137,7 @@ class NewsAgent:
     Now: Uses real Google Search results!
     """
 
-    def __init__(self):
-        self.name = "NewsAgent"
+    name: str = field(default="NewsAgent", init=False)
 
     async def analyze(self, pair: str, config: dict = None) -> Dict[str, Any]:
         """
@@ -38,17 +150,12 @@ class NewsAgent:
         Returns:
             Dict with analysis results including real headlines and sources
         """
-        from langgraph.config import get_stream_writer
-
         logger.info(f"📰 [NewsAgent] Starting analysis for {pair}")
         start_time = time.time()
 
         try:
             # Get stream writer for progress updates
-            writer = get_stream_writer()
-
-            from google import genai
-            from google.genai import types
+            writer = get_writer()
 
             # Emit progress: API initialization (10% progress)
             writer({"agent_progress": {
@@ -56,19 +163,33 @@ class NewsAgent:
                 "step": "initializing_api",
                 "message": "Initializing Gemini API",
                 "progress_percentage": 10,
-                "execution_start_time": datetime.utcnow().isoformat() + "Z"
+                "execution_start_time": utc_isoformat() + "Z"
             }})
 
+            # Extract currencies for better search
+            base, quote = _parse_pair(pair)
+
+            # Recent analysis of the same currencies: skip the grounded search entirely
+            cached = _NEWS_CACHE.get((base, quote))
+            if cached is not None:
+                logger.info(f"✅ [NewsAgent] Using cached analysis for {pair} (< {_NEWS_CACHE_TTL}s old)")
+                writer({"agent_progress": {
+                    "agent": "news",
+                    "step": "complete",
+                    "message": "News analysis served from cache",
+                    "progress_percentage": 100,
+                }})
+                result = replay_result(cached, start_time)
+                result["data"]["pair"] = pair
+                return result
+
             # Get API key
             api_key = os.getenv("GOOGLE_AI_API_KEY")
             if not api_key:
                 raise ValueError("GOOGLE_AI_API_KEY not found in environment")
 
-            # Initialize Gemini client
-            client = genai.Client(api_key=api_key)
-
-            # Extract currencies for better search
-            base, quote = self._parse_pair(pair)
+            # Reuse this event loop's Gemini client for this key
+            client = get_async_client(api_key)
 
             # Emit progress: Building prompt (25% progress)
             writer({"agent_progress": {
@@ -81,15 +202,7 @@ class NewsAgent:
             # Build search-powered analysis prompt
             prompt = self._build_news_prompt(pair, base, quote)
 
-            # Configure Google Search grounding
-            grounding_tool = types.Tool(google_search=types.GoogleSearch())
-
-            config_gemini = types.GenerateContentConfig(
-                temperature=0.2,  # Low temperature for factual news analysis
-                # NOTE: Cannot use response_mime_type with tools
-                tools=[grounding_tool],
-                thinking_config=types.ThinkingConfig(thinking_budget=0),  # Speed over thinking
-            )
+            config_gemini = _news_config()
 
             # Emit progress: Starting Google Search (40% progress)
             writer({"agent_progress": {
@@ -101,7 +214,7 @@ class NewsAgent:
 
             # Generate analysis with Google Search
             logger.debug(f"📰 [NewsAgent] Calling Gemini API with Google Search for {pair}")
-            response = client.models.generate_content(model="gemini-2.5-flash", contents=[prompt], config=config_gemini)
+            response = await client.aio.models.generate_content(model="gemini-2.5-flash", contents=[prompt], config=config_gemini)
             logger.debug(f"📰 [NewsAgent] Received response from Gemini (length: {len(response.text)} chars)")
 
             # Extract grounding metadata FIRST (for web search event)
@@ -148,7 +261,7 @@ class NewsAgent:
             if response_text.endswith("```"):
                 response_text = response_text[:-3]  # Remove trailing ```
 
-            analysis = json.loads(response_text.strip())
+            analysis = orjson.loads(response_text.strip())
 
             # Emit intermediate data as soon as we parse it (90% progress)
             sentiment_score = analysis.get("sentiment_score", 0.0)
@@ -169,7 +282,7 @@ class NewsAgent:
             }})
 
             elapsed = time.time() - start_time
-            execution_end_time = datetime.utcnow().isoformat() + "Z"
+            execution_end_time = utc_isoformat() + "Z"
             logger.info(f"✅ [NewsAgent] Analysis complete in {elapsed:.2f}s - Headlines: {headlines_count}, Sentiment: {sentiment}, Sources: {len(sources)}")
 
             # Emit final completion (100% progress)
@@ -183,7 +296,7 @@ class NewsAgent:
             }})
 
             # Build result with grounding metadata
-            return {
+            result = {
                 "success": True,
                 "agent": self.name,
                 "data": {
@@ -193,7 +306,7 @@ class NewsAgent:
                     "sentiment": sentiment,
                     "impact": analysis.get("impact", "medium"),
                     "news_count": headlines_count,
-                    "analysis_timestamp": datetime.utcnow().isoformat(),
+                    "analysis_timestamp": utc_isoformat(),
                     "summary": analysis.get("summary", "No summary available"),
                     "key_events": analysis.get("key_events", []),
                     # Grounding metadata
@@ -206,6 +319,8 @@ class NewsAgent:
                     "execution_end_time": execution_end_time
                 },
             }
+            _NEWS_CACHE[(base, quote)] = copy.deepcopy(result)
+            return result
 
         except Exception as e:
             elapsed = time.time() - start_time
@@ -219,83 +334,28 @@ class NewsAgent:
                 "data": {},
             }
 
-    def _parse_pair(self, pair: str) -> tuple:
-        """Parse trading pair into base and quote currencies."""
-        if "/" in pair:
-            base, quote = pair.split("/")
-        else:
-            # Assume format like "EURUSD"
-            base = pair[:3]
-            quote = pair[3:]
-        return base.upper(), quote.upper()
-
-    def _build_news_prompt(self, pair: str, base: str, quote: str) -> str:
-        """Build the news analysis prompt for Gemini with Google Search."""
-        return f"""You are a forex news analyst with real-time access to Google Search.
-
-TASK: Analyze current news and market sentiment for {pair} ({base}/{quote})
-
-Use Google Search to find:
-1. Recent news headlines (last 24-48 hours) about:
-   - "{pair} forex news"
-   - "{base} currency news"
-   - "{quote} currency news"
-   - "{base} central bank"
-   - "{base} economy"
-
-2. Major events affecting the currencies:
-   - Central bank decisions
-   - Economic data releases
-   - Geopolitical events
-   - Market sentiment shifts
-
-ANALYSIS REQUIREMENTS:
-
-1. **Headlines** (3-5 most relevant)
-   - Extract ACTUAL recent headlines from search results
-   - Include publication date/time if available
-   - Focus on market-moving news
+    async def analyze_many(self, pairs: List[str], max_concurrency: int = 8) -> List[Dict[str, Any]]:
+        """
+        Analyze news for several currency pairs concurrently.
 
-2. **Sentiment Analysis**
-   - Analyze overall market sentiment from headlines
-   - Score: -1.0 (very bearish) to +1.0 (very bullish)
-   - Consider: tone, events, analyst opinions
+        Each pair is a separate grounded Gemini request; requests run in
+        parallel, bounded by a semaphore to respect API rate limits.
 
-3. **Impact Assessment**
-   - high: Major events (rate decisions, GDP, crises)
-   - medium: Notable events (inflation data, forecasts)
-   - low: Minor events (routine statements)
+        Args:
+            pairs: Currency pairs (e.g., ["EUR/USD", "USD/JPY"])
+            max_concurrency: Maximum number of in-flight Gemini requests
 
-4. **Key Events**
-   - List 2-3 most important recent events
-   - Include dates and brief descriptions
+        Returns:
+            List of analysis results, in the same order as pairs
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
 
-OUTPUT FORMAT (JSON):
-{{
-  "headlines": [
-    {{
-      "title": "Actual headline from search results",
-      "date": "2025-11-05" (if available, else "recent"),
-      "sentiment": "bullish|bearish|neutral",
-      "source": "Publication name if available"
-    }}
-  ],
-  "sentiment_score": 0.0 to 1.0 or -1.0 to 0.0,
-  "sentiment": "bullish|bearish|neutral",
-  "impact": "high|medium|low",
-  "key_events": [
-    "Event 1: Description",
-    "Event 2: Description"
-  ],
-  "summary": "Brief summary of market sentiment and why (1-2 sentences)"
-}}
+        async def _bounded(pair: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.analyze(pair)
 
-CRITICAL:
-- Use ONLY information from Google Search results
-- Do NOT make up headlines or events
-- If no recent news found, indicate in summary
-- Be objective and fact-based
-- Sentiment must reflect actual market conditions
+        return await asyncio.gather(*(_bounded(pair) for pair in pairs))
 
-Analyze now: {pair}
-"""
+    def _build_news_prompt(self, pair: str, base: str, quote: str) -> str:
+        """Build the news analysis prompt for Gemini with Google Search."""
+        return _NEWS_PROMPT_TMPL.format(pair=pair, base=base, quote=quote)
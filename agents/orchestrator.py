@@ -0,0 +1,105 @@
+"""Concurrent fan-out of the analysis agents for a single currency pair."""
+
+import asyncio
+from typing import Dict, Any
+
+from agents.news_agent import NewsAgent
+from agents.technical_agent import TechnicalAgent
+from agents.fundamental_agent import FundamentalAgent
+from agents.risk_agent import RiskAgent
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def _as_result(outcome: Any, agent: str) -> Dict[str, Any]:
+    """
+    Return an agent's result, or a failed-agent result if it raised.
+
+    Agents only turn anticipated failures (bad input, Gemini API or transport
+    errors) into error results; anything else escapes so it is logged with its
+    traceback here instead of being swallowed inside the agent.
+
+    Args:
+        outcome: Agent return value or the exception gathered in its place
+        agent: Agent name reported in the failed result
+
+    Returns:
+        Agent result dict
+    """
+    if not isinstance(outcome, Exception):
+        return outcome
+
+    # Outside an except block, so pass the exception for its traceback
+    logger.error("❌ Error in analyze_all (%s): %s: %s", agent, type(outcome).__name__, outcome, exc_info=outcome)
+    return {"success": False, "agent": agent, "error": str(outcome), "data": {}}
+
+
+async def analyze_all(
+    pair: str,
+    account_balance: float = 10000.0,
+    max_risk_per_trade: float = 0.02,
+    use_llm: bool = True,
+) -> Dict[str, Any]:
+    """
+    Run news, technical, fundamental and risk analysis for a pair concurrently.
+
+    News, technical and fundamental analysis start together, so end-to-end
+    latency is roughly that of the slowest agent rather than the sum. Risk needs
+    the technical entry/stop levels, so it is chained onto the technical task
+    and overlaps with the other two.
+
+    Args:
+        pair: Currency pair (e.g., "EUR/USD")
+        account_balance: Account balance used for position sizing
+        max_risk_per_trade: Maximum risk per trade as decimal (e.g., 0.02 = 2%)
+        use_llm: Whether the technical and fundamental agents use Gemini
+
+    Returns:
+        Dict with news, technical, fundamental and risk results
+    """
+    risk_agent = RiskAgent(account_balance=account_balance, max_risk_per_trade=max_risk_per_trade, use_llm=False)
+
+    technical_task = asyncio.ensure_future(TechnicalAgent(use_llm=use_llm).analyze(pair))
+
+    async def _risk_after_technical() -> Dict[str, Any]:
+        await asyncio.wait([technical_task])
+        technical = technical_task.result() if technical_task.exception() is None else {}
+        if not technical.get("success"):
+            return {
+                "success": False,
+                "agent": risk_agent.name,
+                "error": "Technical analysis required for risk calculation",
+                "data": {},
+            }
+
+        ta_data = technical["data"]
+        direction = "BUY" if ta_data.get("signals", {}).get("overall") == "BUY" else "SELL"
+        return await risk_agent.analyze(
+            pair=pair,
+            entry_price=ta_data.get("current_price"),
+            stop_loss=ta_data.get("stop_loss"),
+            direction=direction,
+            take_profit=ta_data.get("take_profit"),
+        )
+
+    # return_exceptions=True: one agent raising must not discard the others' results
+    outcomes = await asyncio.gather(
+        NewsAgent().analyze(pair),
+        technical_task,
+        FundamentalAgent(use_llm=use_llm).analyze(pair),
+        _risk_after_technical(),
+        return_exceptions=True,
+    )
+    news, technical, fundamental, risk = (
+        _as_result(outcome, agent)
+        for outcome, agent in zip(outcomes, ("NewsAgent", "TechnicalAgent", "FundamentalAgent", risk_agent.name))
+    )
+
+    return {
+        "pair": pair,
+        "news": news,
+        "technical": technical,
+        "fundamental": fundamental,
+        "risk": risk,
+    }
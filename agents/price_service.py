@@ -1,7 +1,12 @@
 """Price Service - Fetches real-time prices from external APIs."""
 
+import asyncio
+import copy
 import os
+import threading
 import requests
+from cachetools import TTLCache
+from requests.adapters import HTTPAdapter
 from typing import Dict, Any, Optional
 from datetime import datetime, timedelta
 import time
@@ -18,6 +23,7 @@ class PriceService:
     Features:
     - Automatic API selection based on asset type
     - Price caching to avoid rate limits
+    - Pooled keep-alive connections shared by all calls
     - Graceful error handling
     - Fallback to mock data
     """
@@ -36,15 +42,32 @@ class PriceService:
     # Cache duration (seconds)
     CACHE_DURATION = 60  # 1 minute
 
+    # Historical/OHLC cache duration (seconds); past days' data doesn't move
+    HISTORY_CACHE_DURATION = 300  # 5 minutes
+
+    # Keep-alive connections kept per API host (covers concurrent enriched-price fetches)
+    POOL_SIZE = 20
+
     def __init__(self):
         """Initialize price service with API keys."""
         self.metal_api_key = os.getenv("METAL_PRICE_API_KEY", "d6f328d4c0d57e82aa2202840197ba1c")
         self.forex_api_key = os.getenv("FOREX_RATE_API_KEY", "f15a3cce2b1df6bf25fc31fe69e9afc4")
 
+        # Pooled keep-alive session, so repeat calls skip the TCP/TLS handshake
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=self.POOL_SIZE)
+        self._session.mount("https://", adapter)
+
         # Price cache
         self._cache = {}
         self._cache_timestamps = {}
 
+        # Historical rate / OHLC caches keyed by (base, quote, date); the lock
+        # guards them against the concurrent enriched-price worker threads
+        self._historical_cache = TTLCache(maxsize=256, ttl=self.HISTORY_CACHE_DURATION)
+        self._ohlc_cache = TTLCache(maxsize=256, ttl=self.HISTORY_CACHE_DURATION)
+        self._history_lock = threading.Lock()
+
     def _convert_date_string(self, date: str) -> str:
         """
         Convert date string to YYYY-MM-DD format.
@@ -126,7 +149,7 @@ class PriceService:
 
             params = {"api_key": self.metal_api_key, "base": quote, "currencies": base}
 
-            response = requests.get(self.METAL_API_URL, params=params, timeout=5)
+            response = self._session.get(self.METAL_API_URL, params=params, timeout=5)
             response.raise_for_status()
 
             data = response.json()
@@ -184,7 +207,7 @@ class PriceService:
 
             params = {"api_key": self.forex_api_key, "base": base, "currencies": quote}
 
-            response = requests.get(self.FOREX_API_URL, params=params, timeout=5)
+            response = self._session.get(self.FOREX_API_URL, params=params, timeout=5)
             response.raise_for_status()
 
             data = response.json()
@@ -236,7 +259,7 @@ class PriceService:
             url = f"{self.METAL_HISTORICAL_URL}/{date}"
             params = {"api_key": self.metal_api_key, "base": quote, "currencies": base}
 
-            response = requests.get(url, params=params, timeout=5)
+            response = self._session.get(url, params=params, timeout=5)
             response.raise_for_status()
 
             data = response.json()
@@ -289,7 +312,7 @@ class PriceService:
                 "currencies": quote,
             }
 
-            response = requests.get(historical_url, params=params, timeout=5)
+            response = self._session.get(historical_url, params=params, timeout=5)
             response.raise_for_status()
 
             data = response.json()
@@ -342,6 +365,10 @@ class PriceService:
                 "source": "forexrateapi" or "metalpriceapi"
             }
         """
+        return self._get_cached(self._historical_cache, pair, date, self._fetch_historical_rates)
+
+    def _fetch_historical_rates(self, pair: str, date: str) -> Optional[Dict[str, Any]]:
+        """Fetch historical exchange rates from the API for the asset type (uncached)."""
         try:
             base, quote = self._parse_pair(pair)
 
@@ -353,7 +380,7 @@ class PriceService:
                 url = f"{self.FOREX_HISTORICAL_URL}/{date}"
                 params = {"api_key": self.forex_api_key, "base": base, "currencies": quote}
 
-                response = requests.get(url, params=params, timeout=5)
+                response = self._session.get(url, params=params, timeout=5)
                 response.raise_for_status()
 
                 data = response.json()
@@ -401,6 +428,10 @@ class PriceService:
                 "source": "forexrateapi" or "metalpriceapi"
             }
         """
+        return self._get_cached(self._ohlc_cache, pair, date, self._fetch_ohlc)
+
+    def _fetch_ohlc(self, pair: str, date: str) -> Optional[Dict[str, Any]]:
+        """Fetch OHLC data from the API for the asset type (uncached)."""
         try:
             base, quote = self._parse_pair(pair)
 
@@ -418,7 +449,7 @@ class PriceService:
                     "date": formatted_date,
                 }
 
-                response = requests.get(self.FOREX_OHLC_URL, params=params, timeout=5)
+                response = self._session.get(self.FOREX_OHLC_URL, params=params, timeout=5)
                 response.raise_for_status()
 
                 data = response.json()
@@ -464,15 +495,40 @@ class PriceService:
         if not current:
             return None
 
-        # Add historical context for both forex and commodities
-        base, quote = self._parse_pair(pair)
-
-        # Get yesterday's OHLC (now supports both forex and commodities)
+        # Get yesterday's OHLC and rate (supports both forex and commodities)
         ohlc = self.get_ohlc(pair, "yesterday")
-
-        # Get yesterday's rate (now supports both forex and commodities)
         historical = self.get_historical_rates(pair, "yesterday")
 
+        return self._enrich(current, ohlc, historical)
+
+    async def aget_enriched_price(self, pair: str) -> Optional[Dict[str, Any]]:
+        """
+        Async get_enriched_price() that fetches all three sources at once.
+
+        The current, OHLC and historical requests hit independent endpoints, so
+        they run concurrently in worker threads and the call takes about one
+        round trip instead of three. Several pairs can be gathered the same way.
+
+        Args:
+            pair: Trading pair (e.g., "EUR/USD", "XAU/USD")
+
+        Returns:
+            Dict with enriched price data including historical context
+        """
+        current, ohlc, historical = await asyncio.gather(
+            asyncio.to_thread(self.get_price, pair),
+            asyncio.to_thread(self.get_ohlc, pair, "yesterday"),
+            asyncio.to_thread(self.get_historical_rates, pair, "yesterday"),
+        )
+        if not current:
+            return None
+
+        return self._enrich(current, ohlc, historical)
+
+    def _enrich(
+        self, current: Dict[str, Any], ohlc: Optional[Dict[str, Any]], historical: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Attach yesterday's OHLC and the price change since yesterday to a current price."""
         # Calculate price change
         price_change = None
         price_change_pct = None
@@ -491,6 +547,28 @@ class PriceService:
 
         return current
 
+    def _get_cached(self, cache: TTLCache, pair: str, date: str, fetch) -> Optional[Dict[str, Any]]:
+        """
+        Return a cached historical/OHLC result, fetching and caching it on a miss.
+
+        Entries are keyed on the resolved date, so "yesterday" moves to the new
+        day at midnight instead of serving the previous bar for the TTL. Callers
+        get their own copy: the cache is shared across threads and _enrich()
+        embeds the result in the price dict it returns.
+        """
+        key = (*self._parse_pair(pair), self._convert_date_string(date))
+        with self._history_lock:
+            cached = cache.get(key)
+        if cached is not None:
+            return copy.deepcopy(cached)
+
+        # Fetch outside the lock so different pairs don't wait on each other
+        result = fetch(pair, date)
+        if result is not None:
+            with self._history_lock:
+                cache[key] = copy.deepcopy(result)
+        return result
+
     def _get_from_cache(self, pair: str) -> Optional[Dict[str, Any]]:
         """Get price from cache if still valid."""
         if pair not in self._cache:
@@ -507,9 +585,12 @@ class PriceService:
         return self._cache[pair]
 
     def clear_cache(self):
-        """Clear price cache."""
+        """Clear price, historical rate and OHLC caches."""
         self._cache.clear()
         self._cache_timestamps.clear()
+        with self._history_lock:
+            self._historical_cache.clear()
+            self._ohlc_cache.clear()
 
     def get_cache_info(self) -> Dict[str, Any]:
         """Get cache statistics."""
@@ -517,6 +598,8 @@ class PriceService:
             "cached_pairs": list(self._cache.keys()),
             "cache_size": len(self._cache),
             "oldest_entry": min(self._cache_timestamps.values()) if self._cache_timestamps else None,
+            "historical_cache_size": len(self._historical_cache),
+            "ohlc_cache_size": len(self._ohlc_cache),
         }
 
 
@@ -3,7 +3,12 @@
 import os
 import json
 from typing import Dict, Any
-from datetime import datetime
+from datetime import datetime, timezone
+
+from utils.gemini import get_client
+from utils.timestamps import utc_isoformat
+
+_UTC = timezone.utc
 
 
 class ReportAgent:
@@ -68,11 +73,10 @@ class ReportAgent:
                     "html": None,
                 }
 
-            from google import genai
             from google.genai import types
 
-            # Initialize Gemini
-            client = genai.Client(api_key=api_key)
+            # Reuse the cached Gemini client
+            client = get_client(api_key)
 
             # Build comprehensive prompt
             prompt = self._build_report_prompt(
@@ -115,7 +119,7 @@ class ReportAgent:
                 "agent": self.name,
                 "html": html,
                 "metadata": {
-                    "generated_at": datetime.utcnow().isoformat(),
+                    "generated_at": utc_isoformat(),
                     "pair": pair,
                     "action": decision.get("action", "UNKNOWN"),
                     "sections": list(report_content.keys()),
@@ -324,7 +328,7 @@ Generate the report content now:"""
         action_color = action_colors.get(action, "#6b7280")
 
         # Format timestamp
-        timestamp = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")
+        timestamp = datetime.now(_UTC).strftime("%Y-%m-%d %H:%M:%S UTC")
 
         # Extract sections from LLM response
         exec_summary = report_content.get("executive_summary", "<p>No summary available</p>")
@@ -603,7 +607,7 @@ Generate the report content now:"""
 
     <div style="text-align: center; margin-top: 40px; padding-top: 20px; border-top: 1px solid #e5e7eb; color: #9ca3af; font-size: 12px;">
         <p>Generated by LangGraph + Gemini 2.5 Flash Multi-Agent Trading Analysis System</p>
-        <p>Report ID: {datetime.utcnow().strftime('%Y%m%d%H%M%S')}-{pair.replace('/', '')}</p>
+        <p>Report ID: {datetime.now(_UTC).strftime('%Y%m%d%H%M%S')}-{pair.replace('/', '')}</p>
     </div>
 </body>
 </html>"""
@@ -2,10 +2,132 @@
 
 import os
 import json
+from dataclasses import dataclass, field
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Dict, Any, Optional
-from datetime import datetime
 
+import httpx
+import numpy as np
 
+from agents._njit import njit
+from utils.gemini import get_async_client
+from utils.timestamps import utc_isoformat
+
+
+# Advisory warning flags produced by the risk kernel
+_WARN_NON_POSITIVE_RISK = 1
+_WARN_LARGE_RISK = 2
+_WARN_LOW_RISK_REWARD = 4
+_WARN_SMALL_RISK = 8
+
+# Standard lot = 100,000 units; pip value for a standard lot on EUR/USD = $10
+_PIP_VALUE_PER_STANDARD_LOT = 10.0
+
+# Pip multipliers keyed by quote currency: for most pairs 1 pip = 0.0001,
+# for JPY-quoted pairs 1 pip = 0.01
+_PIP_MULT = MappingProxyType({"JPY": 100.0})
+_DEFAULT_PIP_MULT = 10000.0
+
+
+@lru_cache(maxsize=256)
+def _pip_mult_for(pair: str) -> float:
+    """Resolve the pip multiplier for a pair ("USD/JPY" or "USDJPY")."""
+    quote = pair.split("/")[1] if "/" in pair else pair[3:]
+    return _PIP_MULT.get(quote.upper(), _DEFAULT_PIP_MULT)
+
+
+@njit(cache=True)
+def _pip_distance(entry, exit, pip_multiplier):
+    """Calculate pip distance between two prices (direction-independent)."""
+    return abs(entry - exit) * pip_multiplier
+
+
+@njit(cache=True)
+def _risk_core(entry, stop_loss, take_profit, has_take_profit, dollar_risk, pip_multiplier):
+    """
+    Numeric core of the rule-based risk calculation.
+
+    Returns:
+        (risk_in_pips, position_size, reward_in_pips,
+         risk_reward_ratio, potential_profit, warning_flags)
+    """
+    risk_in_pips = _pip_distance(entry, stop_loss, pip_multiplier)
+
+    # Position size in standard lots: (Account Risk) / (Risk in Pips * Pip Value)
+    position_size = 0.0
+    if risk_in_pips > 0:
+        position_size = dollar_risk / (risk_in_pips * _PIP_VALUE_PER_STANDARD_LOT)
+
+    reward_in_pips = 0.0
+    risk_reward_ratio = 0.0
+    potential_profit = 0.0
+    if has_take_profit:
+        reward_in_pips = _pip_distance(entry, take_profit, pip_multiplier)
+        if risk_in_pips > 0:
+            risk_reward_ratio = reward_in_pips / risk_in_pips
+            potential_profit = risk_reward_ratio * dollar_risk
+
+    # Advisory checks (informational only, never block the trade)
+    flags = 0
+    if risk_in_pips <= 0:
+        flags |= _WARN_NON_POSITIVE_RISK
+    if risk_in_pips > 1000:
+        flags |= _WARN_LARGE_RISK
+    if has_take_profit and risk_reward_ratio < 1.5:
+        flags |= _WARN_LOW_RISK_REWARD
+    if 0 < risk_in_pips < 10:
+        flags |= _WARN_SMALL_RISK
+
+    return risk_in_pips, position_size, reward_in_pips, risk_reward_ratio, potential_profit, flags
+
+
+def _validate_trade(flags: int, risk_in_pips: float, risk_reward_ratio: float = None) -> tuple:
+    """
+    Translate the kernel's advisory warning flags into a trade validation (ADVISORY ONLY).
+
+    Returns:
+        (approved: bool, reason: str or None)
+
+    Note: These validations are for informational purposes. They provide guidance
+    but won't block the final trading decision.
+    """
+    warnings = []
+
+    # Advisory Check 1: Risk should be positive
+    if flags & _WARN_NON_POSITIVE_RISK:
+        warnings.append(f"Invalid stop loss: risk in pips must be positive (got {risk_in_pips:.1f})")
+
+    # Advisory Check 2: Note if risk is unusually large (informational only)
+    if flags & _WARN_LARGE_RISK:
+        warnings.append(f"Unusually large risk: {risk_in_pips:.1f} pips. This might indicate a data issue or commodity pricing.")
+
+    # Advisory Check 3: Risk/Reward ratio guidance
+    if flags & _WARN_LOW_RISK_REWARD:
+        warnings.append(f"Risk/reward ratio of {risk_reward_ratio:.2f} is below the recommended 1.5:1 minimum")
+
+    # Advisory Check 4: Note if risk is unusually small
+    if flags & _WARN_SMALL_RISK:
+        warnings.append(f"Risk of {risk_in_pips:.1f} pips is quite small. Ensure stop loss is intentional.")
+
+    # Always approve (advisory only), but provide warnings
+    if warnings:
+        return True, " | ".join(warnings)
+
+    return True, None
+
+
+def _generate_summary(approved: bool, position_size: float, dollar_risk: float, max_risk_per_trade: float, reason: str = None) -> str:
+    """Generate risk analysis summary."""
+    base_summary = f"Position size {position_size:.2f} lots, risking ${dollar_risk:.2f} ({max_risk_per_trade*100:.1f}% of account)"
+
+    if reason:
+        return f"{base_summary}. ⚠️ Advisory warnings: {reason}"
+
+    return f"{base_summary}. No risk warnings detected."
+
+
+@dataclass(slots=True)
 class RiskAgent:
     """
     Calculates risk management parameters for trades with intelligent LLM analysis.
@@ -21,21 +143,27 @@ class RiskAgent:
     2. Use Gemini to analyze risk factors and market conditions
     3. Generate comprehensive risk assessment
     4. Return structured JSON with recommendations
+
+    Attributes:
+        account_balance: Total account balance
+        max_risk_per_trade: Maximum risk per trade as decimal (e.g., 0.02 = 2%)
+        use_llm: Whether to use LLM for enhanced risk analysis
     """
 
-    def __init__(self, account_balance: float = 10000.0, max_risk_per_trade: float = 0.02, use_llm: bool = True):
-        """
-        Initialize Risk Agent.
+    account_balance: float = 10000.0
+    max_risk_per_trade: float = 0.02
+    use_llm: bool = True
+    name: str = field(default="RiskAgent", init=False)
+    _dollar_risk: float = field(init=False, repr=False)
 
-        Args:
-            account_balance: Total account balance
-            max_risk_per_trade: Maximum risk per trade as decimal (e.g., 0.02 = 2%)
-            use_llm: Whether to use LLM for enhanced risk analysis
-        """
-        self.name = "RiskAgent"
-        self.account_balance = account_balance
-        self.max_risk_per_trade = max_risk_per_trade
-        self.use_llm = use_llm
+    def __post_init__(self):
+        self._dollar_risk = float(self.account_balance) * float(self.max_risk_per_trade)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        # Keep the precomputed dollar risk in sync if account settings change after init
+        if name in ("account_balance", "max_risk_per_trade") and hasattr(self, "_dollar_risk"):
+            object.__setattr__(self, "_dollar_risk", float(self.account_balance) * float(self.max_risk_per_trade))
 
     async def analyze(
         self,
@@ -65,15 +193,8 @@ class RiskAgent:
         try:
             # Always perform rule-based calculations first
             risk_calc = self._calculate_risk_params(pair, entry_price, stop_loss, direction, take_profit, leverage)
-
-            if self.use_llm and market_context:
-                # Enhance with LLM analysis
-                return await self._analyze_with_llm(pair, risk_calc, market_context)
-            else:
-                # Return rule-based analysis only
-                return risk_calc
-
-        except Exception as e:
+        except (TypeError, ValueError) as e:
+            # Missing or non-numeric prices
             print(f"  ⚠️  Risk Agent error: {str(e)}")
             return {
                 "success": False,
@@ -82,6 +203,81 @@ class RiskAgent:
                 "data": {},
             }
 
+        if self.use_llm and market_context:
+            # Enhance with LLM analysis (falls back to risk_calc on failure)
+            return await self._analyze_with_llm(pair, risk_calc, market_context)
+
+        # Return rule-based analysis only
+        return risk_calc
+
+    def analyze_batch(
+        self,
+        pairs,
+        entries: np.ndarray,
+        stops: np.ndarray,
+        tps: np.ndarray,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Rule-based risk calculation for many candidate trades at once.
+
+        Evaluates the same formulas as the scalar path with vectorized NumPy
+        arithmetic, for backtests and parameter sweeps over (entry, stop, tp)
+        triplets. No LLM calls are made.
+
+        Args:
+            pairs: Currency pair per trade (e.g., ["EUR/USD", ...])
+            entries: Entry prices, shape (N,)
+            stops: Stop loss prices, shape (N,)
+            tps: Take profit prices, shape (N,); NaN or 0 means no take profit
+
+        Direction is not needed: pip distances are absolute price differences,
+        exactly as on the scalar path.
+
+        Returns:
+            Dict of arrays (structure of arrays), each of shape (N,):
+            risk_pips, reward_pips, pos_size, rr, potential_profit,
+            dollar_risk, warning_flags (bitmask of the advisory checks),
+            no_warnings (True where no advisory check fired) and
+            trade_approved (always True, like analyze(): checks are advisory).
+        """
+        entries = np.asarray(entries, dtype=np.float64)
+        stops = np.asarray(stops, dtype=np.float64)
+        tps = np.asarray(tps, dtype=np.float64)
+        if not (len(pairs) == entries.shape[0] == stops.shape[0] == tps.shape[0]):
+            raise ValueError("pairs, entries, stops and tps must have the same length")
+
+        # Pip distance is direction-independent (absolute price difference)
+        pip_mult = np.fromiter((_pip_mult_for(pair) for pair in pairs), dtype=np.float64, count=len(pairs))
+        dollar_risk = self._dollar_risk
+
+        has_tp = np.isfinite(tps) & (tps != 0)
+        risk = np.abs(entries - stops) * pip_mult
+        reward = np.where(has_tp, np.abs(tps - entries) * pip_mult, 0.0)
+
+        positive = risk > 0
+        safe_risk = np.where(positive, risk, 1.0)
+        pos_size = np.where(positive, dollar_risk / (safe_risk * _PIP_VALUE_PER_STANDARD_LOT), 0.0)
+        rr = np.where(has_tp & positive, reward / safe_risk, 0.0)
+
+        flags = (
+            np.where(~positive, _WARN_NON_POSITIVE_RISK, 0)
+            | np.where(risk > 1000, _WARN_LARGE_RISK, 0)
+            | np.where(has_tp & (rr < 1.5), _WARN_LOW_RISK_REWARD, 0)
+            | np.where(positive & (risk < 10), _WARN_SMALL_RISK, 0)
+        ).astype(np.int8)
+
+        return {
+            "risk_pips": risk,
+            "reward_pips": reward,
+            "pos_size": pos_size,
+            "rr": rr,
+            "potential_profit": rr * dollar_risk,
+            "dollar_risk": np.full(risk.shape, dollar_risk),
+            "warning_flags": flags,
+            "no_warnings": flags == 0,
+            "trade_approved": np.ones(risk.shape, dtype=bool),
+        }
+
     def _calculate_risk_params(
         self,
         pair: str,
@@ -92,32 +288,40 @@ class RiskAgent:
         leverage: float,
     ) -> Dict[str, Any]:
         """Calculate risk parameters using rule-based approach."""
-        # Calculate risk per pip
-        risk_in_pips = self._calculate_pips(entry_price, stop_loss, direction)
-
-        # Calculate position size
-        position_size = self._calculate_position_size(risk_in_pips, pair)
-
-        # Calculate dollar risk
-        dollar_risk = self.account_balance * self.max_risk_per_trade
+        has_take_profit = bool(take_profit)
+
+        (
+            risk_in_pips,
+            position_size,
+            reward_in_pips,
+            risk_reward_ratio,
+            potential_profit,
+            flags,
+        ) = _risk_core(
+            float(entry_price),
+            float(stop_loss),
+            float(take_profit) if has_take_profit else 0.0,
+            has_take_profit,
+            self._dollar_risk,
+            _pip_mult_for(pair),
+        )
 
         # Calculate reward if take profit provided
         reward_data = {}
-        risk_reward_ratio = None
-        if take_profit:
-            reward_in_pips = self._calculate_pips(entry_price, take_profit, direction, reward=True)
-            risk_reward_ratio = reward_in_pips / risk_in_pips if risk_in_pips > 0 else 0
-            potential_profit = (reward_in_pips / risk_in_pips) * dollar_risk if risk_in_pips > 0 else 0
-
+        if has_take_profit:
             reward_data = {
                 "take_profit": take_profit,
                 "reward_in_pips": round(reward_in_pips, 1),
                 "risk_reward_ratio": round(risk_reward_ratio, 2),
                 "potential_profit": round(potential_profit, 2),
             }
+        else:
+            risk_reward_ratio = None
+
+        dollar_risk = self._dollar_risk
 
         # Validate trade
-        trade_approved, rejection_reason = self._validate_trade(risk_in_pips, risk_reward_ratio)
+        trade_approved, rejection_reason = _validate_trade(flags, risk_in_pips, risk_reward_ratio)
 
         return {
             "success": True,
@@ -136,8 +340,8 @@ class RiskAgent:
                 **reward_data,
                 "trade_approved": trade_approved,
                 "rejection_reason": rejection_reason,
-                "analysis_timestamp": datetime.utcnow().isoformat(),
-                "summary": self._generate_summary(trade_approved, position_size, dollar_risk, rejection_reason),
+                "analysis_timestamp": utc_isoformat(),
+                "summary": _generate_summary(trade_approved, position_size, dollar_risk, self.max_risk_per_trade, rejection_reason),
                 "data_source": "rule_based",
             },
         }
@@ -149,7 +353,7 @@ class RiskAgent:
         market_context: Dict[str, Any],
     ) -> Dict[str, Any]:
         """Enhance risk analysis with Gemini LLM for market context and risk factors."""
-        from google import genai
+        from google.genai import errors as genai_errors
         from google.genai import types
 
         # Get API key
@@ -158,22 +362,22 @@ class RiskAgent:
             # Fallback to rule-based if no API key
             return risk_calc
 
-        # Initialize Gemini
-        client = genai.Client(api_key=api_key)
+        try:
+            # Reuse this event loop's Gemini client
+            client = get_async_client(api_key)
 
-        # Build risk analysis prompt
-        prompt = self._build_risk_prompt(pair, risk_calc, market_context)
+            # Build risk analysis prompt
+            prompt = self._build_risk_prompt(pair, risk_calc, market_context)
 
-        # Configure Gemini without Google Search (to avoid API conflicts with JSON response)
-        config = types.GenerateContentConfig(
-            temperature=0.3,
-            response_mime_type="application/json",
-            thinking_config=types.ThinkingConfig(thinking_budget=0),
-        )
+            # Configure Gemini without Google Search (to avoid API conflicts with JSON response)
+            config = types.GenerateContentConfig(
+                temperature=0.3,
+                response_mime_type="application/json",
+                thinking_config=types.ThinkingConfig(thinking_budget=0),
+            )
 
-        try:
             # Generate enhanced risk analysis
-            response = client.models.generate_content(
+            response = await client.aio.models.generate_content(
                 model="gemini-2.5-flash",
                 contents=[prompt],
                 config=config
@@ -207,93 +411,11 @@ class RiskAgent:
                 "data": risk_data,
             }
 
-        except Exception as e:
+        except (ValueError, KeyError, genai_errors.APIError, httpx.HTTPError) as e:
+            # Malformed LLM payload, Gemini API or transport failure (e.g. timeout)
             print(f"  ⚠️  LLM risk analysis failed: {str(e)}, using rule-based")
             return risk_calc
 
-    def _calculate_pips(self, entry: float, exit: float, direction: str, reward: bool = False) -> float:
-        """Calculate pip distance between two prices."""
-        # For most pairs, 1 pip = 0.0001
-        # For JPY pairs, 1 pip = 0.01
-        pip_multiplier = 10000  # Standard pairs
-        # TODO: Detect JPY pairs and use 100 instead
-
-        if direction == "BUY":
-            if reward:
-                return abs(exit - entry) * pip_multiplier
-            else:
-                return abs(entry - exit) * pip_multiplier
-        else:  # SELL
-            if reward:
-                return abs(entry - exit) * pip_multiplier
-            else:
-                return abs(exit - entry) * pip_multiplier
-
-    def _calculate_position_size(self, risk_in_pips: float, pair: str) -> float:
-        """
-        Calculate position size in lots.
-
-        Formula: Position Size = (Account Risk) / (Risk in Pips * Pip Value)
-        """
-        # Standard lot = 100,000 units
-        # Pip value for standard lot on EUR/USD = $10
-        # We'll calculate position size in standard lots
-
-        dollar_risk = self.account_balance * self.max_risk_per_trade
-        pip_value_per_standard_lot = 10  # USD
-
-        if risk_in_pips <= 0:
-            return 0.0
-
-        # Position size in standard lots
-        position_size = dollar_risk / (risk_in_pips * pip_value_per_standard_lot)
-
-        return position_size
-
-    def _validate_trade(self, risk_in_pips: float, risk_reward_ratio: float = None) -> tuple:
-        """
-        Validate if trade meets risk management criteria (ADVISORY ONLY).
-
-        Returns:
-            (approved: bool, reason: str or None)
-
-        Note: These validations are for informational purposes. They provide guidance
-        but won't block the final trading decision.
-        """
-        warnings = []
-
-        # Advisory Check 1: Risk should be positive
-        if risk_in_pips <= 0:
-            warnings.append(f"Invalid stop loss: risk in pips must be positive (got {risk_in_pips:.1f})")
-
-        # Advisory Check 2: Note if risk is unusually large (informational only)
-        if risk_in_pips > 1000:
-            warnings.append(f"Unusually large risk: {risk_in_pips:.1f} pips. This might indicate a data issue or commodity pricing.")
-
-        # Advisory Check 3: Risk/Reward ratio guidance
-        if risk_reward_ratio is not None:
-            if risk_reward_ratio < 1.5:
-                warnings.append(f"Risk/reward ratio of {risk_reward_ratio:.2f} is below the recommended 1.5:1 minimum")
-
-        # Advisory Check 4: Note if risk is unusually small
-        if 0 < risk_in_pips < 10:
-            warnings.append(f"Risk of {risk_in_pips:.1f} pips is quite small. Ensure stop loss is intentional.")
-
-        # Always approve (advisory only), but provide warnings
-        if warnings:
-            return True, " | ".join(warnings)
-
-        return True, None
-
-    def _generate_summary(self, approved: bool, position_size: float, dollar_risk: float, reason: str = None) -> str:
-        """Generate risk analysis summary."""
-        base_summary = f"Position size {position_size:.2f} lots, risking ${dollar_risk:.2f} ({self.max_risk_per_trade*100:.1f}% of account)"
-
-        if reason:
-            return f"{base_summary}. ⚠️ Advisory warnings: {reason}"
-
-        return f"{base_summary}. No risk warnings detected."
-
     def _build_risk_prompt(self, pair: str, risk_calc: Dict[str, Any], market_context: Dict[str, Any]) -> str:
         """Build the risk analysis prompt for Gemini."""
 
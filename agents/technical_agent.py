@@ -2,8 +2,156 @@
 
 import os
 import json
-from typing import Dict, Any
-from datetime import datetime
+import asyncio
+from typing import Dict, Any, ClassVar, List, Mapping, Tuple
+from functools import lru_cache
+from types import MappingProxyType
+
+import numpy as np
+
+from agents._njit import njit
+from agents._rng import get_rng
+from utils.gemini import get_async_client
+from utils.stream import get_writer
+from utils.timestamps import utc_isoformat, utc_isoformat_coarse
+
+
+# Fixed envelope keys of analyze() results; variable fields are merged in per call
+_SUCCESS_TEMPLATE = MappingProxyType({"success": True, "agent": "TechnicalAgent"})
+_ERROR_TEMPLATE = MappingProxyType({"success": False, "agent": "TechnicalAgent"})
+
+# Mock price range for pairs without an entry in TechnicalAgent._PRICE_RANGES
+_DEFAULT_PRICE_RANGE = (1.0, 1.5)
+
+# Mock indicator draws: rsi, macd, ma50/price, ma200/price as offset + scale * U[0, 1).
+# float32 is ample for these bounded draws; prices are applied in float64 by the core.
+_INDICATOR_OFFSET = np.array([30.0, -0.01, 0.98, 0.95], dtype=np.float32)
+_INDICATOR_SCALE = np.array([40.0, 0.02, 0.04, 0.10], dtype=np.float32)
+
+
+def _draw_indicators() -> np.ndarray:
+    """Draw the four mock indicator inputs in one float32 pass."""
+    draws = get_rng().random(4, dtype=np.float32)
+    draws *= _INDICATOR_SCALE
+    draws += _INDICATOR_OFFSET
+    return draws
+
+
+@njit(cache=True)
+def _rule_based_core(current_price, rsi_draw, macd_draw, ma50_ratio, ma200_ratio):
+    """
+    Numeric core of the rule-based technical analysis.
+
+    Args:
+        current_price: Current price of the pair
+        rsi_draw, macd_draw, ma50_ratio, ma200_ratio: Uniform draws for
+            (rsi, macd, ma50/price, ma200/price)
+
+    Returns:
+        (rsi, macd, moving_avg_50, moving_avg_200, rsi_sign, rsi_zone,
+         support, resistance, stop_loss, take_profit)
+    """
+    rsi = round(rsi_draw, 2)
+    macd = round(macd_draw, 4)
+    moving_avg_50 = round(current_price * ma50_ratio, 5)
+    moving_avg_200 = round(current_price * ma200_ratio, 5)
+
+    # Trend follows RSI vs 50; signals follow the RSI zone (<40 / >60)
+    rsi_sign = int(rsi > 50) - int(rsi < 50)
+    rsi_zone = int(rsi > 60) - int(rsi < 40)
+
+    # Simple levels
+    support = round(current_price * 0.98, 5)
+    resistance = round(current_price * 1.02, 5)
+
+    return (
+        rsi,
+        macd,
+        moving_avg_50,
+        moving_avg_200,
+        rsi_sign,
+        rsi_zone,
+        support,
+        resistance,
+        round(support * 0.995, 5),
+        round(resistance * 1.005, 5),
+    )
+
+
+# Support / resistance as fractions of the current price (batch path)
+_LEVEL_RATIOS = np.array([0.98, 1.02])
+
+
+def _rule_based_batch(prices: np.ndarray, draws: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """
+    Vectorized _rule_based_core over a batch of pairs.
+
+    Args:
+        prices: (N,) float64 current prices
+        draws: (N, 4) indicator draws from offset + scale * U[0, 1)
+
+    Returns:
+        The same columns as _rule_based_core, each an (N,) array
+    """
+    draws = draws.astype(np.float64)
+    rsi = np.round(draws[:, 0], 2)
+    macd = np.round(draws[:, 1], 4)
+    moving_avgs = np.round(prices[:, None] * draws[:, 2:], 5)
+    levels = np.round(prices[:, None] * _LEVEL_RATIOS, 5)
+    support, resistance = levels[:, 0], levels[:, 1]
+
+    rsi_sign = np.sign(rsi - 50).astype(np.int64)
+    rsi_zone = (rsi > 60).astype(np.int64) - (rsi < 40)
+
+    return (
+        rsi,
+        macd,
+        moving_avgs[:, 0],
+        moving_avgs[:, 1],
+        rsi_sign,
+        rsi_zone,
+        support,
+        resistance,
+        np.round(support * 0.995, 5),
+        np.round(resistance * 1.005, 5),
+    )
+
+
+@lru_cache(maxsize=None)
+def _trend_core(rsi_sign: int) -> str:
+    """Rule-based trend from the sign of (RSI - 50)."""
+    return "uptrend" if rsi_sign > 0 else "downtrend" if rsi_sign < 0 else "sideways"
+
+
+# Rule-based signal strengths; compared as ints, stringified only for output
+_WEAK, _MODERATE = 1, 2
+_STRENGTH_LABELS = MappingProxyType({_WEAK: "weak", _MODERATE: "moderate"})
+
+
+def _overall_signal(buy_strength: int, sell_strength: int) -> str:
+    """Overall signal from integer buy/sell strengths."""
+    if buy_strength > sell_strength:
+        return "BUY"
+    if sell_strength > buy_strength:
+        return "SELL"
+    return "HOLD"
+
+
+@lru_cache(maxsize=None)
+def _signal_core(rsi_zone: int) -> tuple:
+    """
+    Rule-based (buy, sell, overall) signals for an RSI zone.
+
+    Args:
+        rsi_zone: -1 if RSI < 40 (oversold), 1 if RSI > 60 (overbought), else 0
+    """
+    buy_strength = _MODERATE if rsi_zone < 0 else _WEAK
+    sell_strength = _MODERATE if rsi_zone > 0 else _WEAK
+    return (
+        _STRENGTH_LABELS[buy_strength],
+        _STRENGTH_LABELS[sell_strength],
+        _overall_signal(buy_strength, sell_strength),
+    )
 
 
 class TechnicalAgent:
@@ -23,10 +171,27 @@ class TechnicalAgent:
     4. Return structured JSON
     """
 
+    # Mock price ranges (low, high) per pair
+    _PRICE_RANGES: ClassVar[Mapping[str, Tuple[float, float]]] = MappingProxyType({
+        "EUR/USD": (1.05, 1.12),
+        "GBP/USD": (1.20, 1.30),
+        "USD/JPY": (140.0, 152.0),
+        "XAU/USD": (2600.0, 2700.0),
+        "BTC/USD": (90000.0, 100000.0),
+    })
+
     def __init__(self, use_real_prices: bool = True, use_llm: bool = True):
         self.name = "TechnicalAgent"
         self.use_real_prices = use_real_prices
         self.use_llm = use_llm
+        # Mock price draws specialized per known pair, range constants bound as defaults
+        self._specialized = {
+            pair: (lambda low=low, high=high: round(float(get_rng().uniform(low, high)), 2))
+            for pair, (low, high) in self._PRICE_RANGES.items()
+        }
+        self._default_price_fn = (
+            lambda low=_DEFAULT_PRICE_RANGE[0], high=_DEFAULT_PRICE_RANGE[1]: round(float(get_rng().uniform(low, high)), 2)
+        )
 
     async def analyze(self, pair: str, config: dict = None) -> Dict[str, Any]:
         """
@@ -39,14 +204,13 @@ class TechnicalAgent:
         Returns:
             Dict with structured technical analysis results
         """
-        from langgraph.config import get_stream_writer
         import time
 
         start_time = time.time()
 
         try:
             # Get stream writer for progress updates
-            writer = get_stream_writer()
+            writer = get_writer()
 
             # Emit progress: Starting (10% progress)
             writer({"agent_progress": {
@@ -54,11 +218,11 @@ class TechnicalAgent:
                 "step": "fetching_price",
                 "message": f"Fetching real-time price for {pair}",
                 "progress_percentage": 10,
-                "execution_start_time": datetime.utcnow().isoformat() + "Z"
+                "execution_start_time": utc_isoformat() + "Z"
             }})
 
-            # Get current price with historical context
-            price_data, price_source = self._get_price(pair)
+            # Get current price with historical context (its three requests run concurrently)
+            price_data, price_source = await self._get_price(pair)
 
             # Emit progress: Price fetched (30% progress)
             current_price = price_data["price"] if isinstance(price_data, dict) else price_data
@@ -93,16 +257,68 @@ class TechnicalAgent:
 
         except Exception as e:
             print(f"  ⚠️  Technical Agent error: {str(e)}")
-            return {
-                "success": False,
-                "agent": self.name,
-                "error": str(e),
-                "data": {},
-            }
+            return {**_ERROR_TEMPLATE, "error": str(e), "data": {}}
+
+    async def analyze_batch(self, pairs: List[str]) -> List[Dict[str, Any]]:
+        """
+        Rule-based technical analysis for several pairs in one vectorized pass.
+
+        Prices are fetched concurrently; indicator draws and levels for all
+        pairs are then computed as (N, 4) array operations instead of one
+        core call per pair. No LLM or stream events are involved.
+
+        Args:
+            pairs: Currency pairs (e.g., ["EUR/USD", "XAU/USD"])
+
+        Returns:
+            One analyze()-shaped result per pair, in input order
+        """
+        if not pairs:
+            return []
+
+        quotes = await asyncio.gather(*(self._get_price(pair) for pair in pairs))
+        prices = np.array([price_data["price"] for price_data, _ in quotes], dtype=np.float64)
+
+        draws = get_rng().random((len(pairs), 4), dtype=np.float32)
+        draws *= _INDICATOR_SCALE
+        draws += _INDICATOR_OFFSET
+
+        # Back to Python scalars once per column, then zip rows
+        columns = [column.tolist() for column in _rule_based_batch(prices, draws)]
+        timestamp = utc_isoformat_coarse()
+
+        results = []
+        for (pair, (price_data, price_source), row) in zip(pairs, quotes, zip(*columns)):
+            rsi, macd, ma50, ma200, rsi_sign, rsi_zone, support, resistance, stop_loss, take_profit = row
+            trend = _trend_core(rsi_sign)
+            buy, sell, overall = _signal_core(rsi_zone)
+            results.append({
+                **_SUCCESS_TEMPLATE,
+                "data": {
+                    "pair": pair,
+                    "current_price": price_data["price"],
+                    "price_source": price_source,
+                    "trend": trend,
+                    "support": support,
+                    "resistance": resistance,
+                    "indicators": {
+                        "rsi": rsi,
+                        "macd": macd,
+                        "moving_avg_50": ma50,
+                        "moving_avg_200": ma200,
+                    },
+                    "signals": {"buy": buy, "sell": sell, "overall": overall},
+                    "stop_loss": stop_loss,
+                    "take_profit": take_profit,
+                    "analysis_timestamp": timestamp,
+                    "summary": f"Technical analysis shows {trend} with {overall} signal.",
+                    "data_source": "rule_based",
+                },
+            })
+        return results
 
     async def _analyze_with_llm(self, pair: str, price_data: Dict[str, Any], price_source: str, writer, start_time: float) -> Dict[str, Any]:
         """Use Gemini LLM for intelligent technical analysis."""
-        from google import genai
         from google.genai import types
         import time
 
@@ -111,8 +327,8 @@ class TechnicalAgent:
         if not api_key:
             raise ValueError("GOOGLE_AI_API_KEY not found")
 
-        # Initialize Gemini
-        client = genai.Client(api_key=api_key)
+        # Reuse this event loop's Gemini client
+        client = get_async_client(api_key)
 
         # Extract price information
         current_price = price_data["price"] if isinstance(price_data, dict) else price_data
@@ -142,7 +358,7 @@ class TechnicalAgent:
         config = types.GenerateContentConfig(**config_params)
 
         # Generate analysis
-        response = client.models.generate_content(
+        response = await client.aio.models.generate_content(
             model="gemini-2.5-flash",
             contents=[prompt],
             config=config
@@ -222,7 +438,7 @@ class TechnicalAgent:
         }})
 
         elapsed = time.time() - start_time
-        execution_end_time = datetime.utcnow().isoformat() + "Z"
+        execution_end_time = utc_isoformat() + "Z"
 
         # Emit completion (100% progress)
         writer({"agent_progress": {
@@ -236,8 +452,7 @@ class TechnicalAgent:
 
         # Build structured result
         return {
-            "success": True,
-            "agent": self.name,
+            **_SUCCESS_TEMPLATE,
             "data": {
                 "pair": pair,
                 "current_price": current_price,
@@ -256,7 +471,7 @@ class TechnicalAgent:
                 "reasoning": analysis.get("reasoning", ""),
                 "key_levels": analysis.get("key_levels", []),
                 # Metadata
-                "analysis_timestamp": datetime.utcnow().isoformat(),
+                "analysis_timestamp": utc_isoformat_coarse(),
                 "summary": analysis.get("summary", ""),
                 "data_source": "llm_analysis",
                 "search_queries": search_queries,
@@ -270,7 +485,6 @@ class TechnicalAgent:
 
     def _analyze_rule_based(self, pair: str, current_price: float, price_source: str, writer, start_time: float) -> Dict[str, Any]:
         """Fallback rule-based analysis (original logic)."""
-        import random
         import time
 
         # Simple rule-based indicators (70% progress)
@@ -281,26 +495,30 @@ class TechnicalAgent:
             "progress_percentage": 70
         }})
 
+        # Draw all indicators at once; the numeric chain runs in the (optionally JIT-compiled) core
+        (
+            rsi,
+            macd,
+            ma50,
+            ma200,
+            rsi_sign,
+            rsi_zone,
+            support,
+            resistance,
+            stop_loss,
+            take_profit,
+        ) = _rule_based_core(float(current_price), *_draw_indicators().tolist())
         indicators = {
-            "rsi": round(random.uniform(30, 70), 2),
-            "macd": round(random.uniform(-0.01, 0.01), 4),
-            "moving_avg_50": round(current_price * random.uniform(0.98, 1.02), 5),
-            "moving_avg_200": round(current_price * random.uniform(0.95, 1.05), 5),
+            "rsi": rsi,
+            "macd": macd,
+            "moving_avg_50": ma50,
+            "moving_avg_200": ma200,
         }
 
-        # Simple trend
-        trend = "uptrend" if indicators["rsi"] > 50 else "downtrend" if indicators["rsi"] < 50 else "sideways"
-
-        # Simple levels
-        support = round(current_price * 0.98, 5)
-        resistance = round(current_price * 1.02, 5)
-
-        # Simple signals
-        signals = {
-            "buy": "moderate" if indicators["rsi"] < 40 else "weak",
-            "sell": "moderate" if indicators["rsi"] > 60 else "weak",
-            "overall": "BUY" if indicators["rsi"] < 40 else "SELL" if indicators["rsi"] > 60 else "HOLD",
-        }
+        # Simple trend and signals
+        trend = _trend_core(rsi_sign)
+        buy, sell, overall = _signal_core(rsi_zone)
+        signals = {"buy": buy, "sell": sell, "overall": overall}
 
         # Emit intermediate data (90% progress)
         writer({"agent_progress": {
@@ -317,7 +535,7 @@ class TechnicalAgent:
         }})
 
         elapsed = time.time() - start_time
-        execution_end_time = datetime.utcnow().isoformat() + "Z"
+        execution_end_time = utc_isoformat() + "Z"
 
         # Emit completion (100% progress)
         writer({"agent_progress": {
@@ -330,8 +548,7 @@ class TechnicalAgent:
         }})
 
         return {
-            "success": True,
-            "agent": self.name,
+            **_SUCCESS_TEMPLATE,
             "data": {
                 "pair": pair,
                 "current_price": current_price,
@@ -341,10 +558,10 @@ class TechnicalAgent:
                 "resistance": resistance,
                 "indicators": indicators,
                 "signals": signals,
-                "stop_loss": round(support * 0.995, 5),
-                "take_profit": round(resistance * 1.005, 5),
-                "analysis_timestamp": datetime.utcnow().isoformat(),
-                "summary": f"Technical analysis shows {trend} with {signals['overall']} signal.",
+                "stop_loss": stop_loss,
+                "take_profit": take_profit,
+                "analysis_timestamp": utc_isoformat_coarse(),
+                "summary": f"Technical analysis shows {trend} with {overall} signal.",
                 "data_source": "rule_based",
                 # Execution timing
                 "execution_time": elapsed,
@@ -353,13 +570,13 @@ class TechnicalAgent:
             },
         }
 
-    def _get_price(self, pair: str) -> tuple:
+    async def _get_price(self, pair: str) -> tuple:
         """Get current price for the pair with historical context."""
         if self.use_real_prices:
             from agents.price_service import get_price_service
 
             price_service = get_price_service()
-            price_data = price_service.get_enriched_price(pair)
+            price_data = await price_service.aget_enriched_price(pair)
 
             if price_data:
                 print(f"     💰 Real price: ${price_data['price']} from {price_data['source']}")
@@ -381,16 +598,7 @@ class TechnicalAgent:
 
     def _get_mock_price(self, pair: str) -> float:
         """Get mock price for testing."""
-        import random
-        price_ranges = {
-            "EUR/USD": (1.05, 1.12),
-            "GBP/USD": (1.20, 1.30),
-            "USD/JPY": (140.0, 152.0),
-            "XAU/USD": (2600.0, 2700.0),
-            "BTC/USD": (90000.0, 100000.0),
-        }
-        range_vals = price_ranges.get(pair, (1.0, 1.5))
-        return round(random.uniform(range_vals[0], range_vals[1]), 2)
+        return self._specialized.get(pair, self._default_price_fn)()
 
     def _build_technical_prompt(self, pair: str, price_data: Dict[str, Any], price_source: str) -> str:
         """Build the technical analysis prompt for Gemini with historical context."""
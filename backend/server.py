@@ -1,18 +1,24 @@
 """FastAPI server with SSE streaming for Forex Agent System."""
 
 import os
-import json
 import asyncio
 import time
-from typing import Optional
+from contextlib import asynccontextmanager
+from functools import cache, lru_cache
+from typing import Any, AsyncIterator, Dict, List, Optional
+import orjson
+from cachetools import TTLCache
 from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from sse_starlette.sse import EventSourceResponse
+from fastapi.responses import JSONResponse, Response
+from sse_starlette.sse import EventSourceResponse, ServerSentEvent
 from pydantic import BaseModel
-from dotenv import load_dotenv
 
+from agents._njit import NUMBA_AVAILABLE
+from agents.risk_agent import _pip_distance, _risk_core
+from agents.technical_agent import TechnicalAgent, _rule_based_core
 from backend.streaming_adapter import StreamingForexSystem
+from utils.env import load_env
 from utils.logger import get_logger
 from utils.social_formatter import (
     format_for_twitter,
@@ -25,13 +31,42 @@ from utils.social_formatter import (
 logger = get_logger(__name__)
 
 # Load environment variables
-load_dotenv()
+load_env()
+
+def _warm_kernels():
+    """
+    Run each numeric agent kernel once with dummy inputs of the production argument types.
+
+    With numba installed this triggers (or loads from the on-disk cache) the JIT
+    compilation, which would otherwise land on the first real request.
+    """
+    _rule_based_core(1.0, 0.5, 0.5, 1.0, 1.0)
+    _risk_core(1.1, 1.09, 1.12, True, 200.0, 10000.0)
+    _pip_distance(1.1, 1.09, 10000.0)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Build the default streaming system and warm the JIT kernels at startup so the first request doesn't pay for them."""
+    start = time.perf_counter()
+    await asyncio.to_thread(_warm_kernels)
+    logger.info("🔥 [API] Numeric kernels warmed (numba: %s) in %.2fs", NUMBA_AVAILABLE, time.perf_counter() - start)
+
+    try:
+        get_system()
+        logger.info("🚀 [API] Streaming system initialized")
+    except ValueError as e:
+        # Missing configuration (e.g. API key): keep serving, /health reports it
+        logger.warning("⚠️  [API] Streaming system not initialized at startup: %s", e)
+    yield
+
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Forex Agent System API",
     description="Real-time streaming API for multi-agent forex/commodity trading analysis",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan,
 )
 
 # Configure CORS
@@ -48,16 +83,126 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Global system instance (initialized on first request)
-_system: Optional[StreamingForexSystem] = None
+@cache
+def get_system() -> StreamingForexSystem:
+    """Get or initialize the streaming system (built once, on first successful call)."""
+    return StreamingForexSystem()
 
 
-def get_system() -> StreamingForexSystem:
-    """Get or initialize the streaming system."""
-    global _system
-    if _system is None:
-        _system = StreamingForexSystem()
-    return _system
+@cache
+def _batch_technical_agent() -> TechnicalAgent:
+    """Rule-based technical agent shared by /analyze/batch."""
+    return TechnicalAgent(use_llm=False)
+
+
+@lru_cache(maxsize=64)
+def _system_for(account_balance: Optional[float], max_risk_per_trade: Optional[float]) -> StreamingForexSystem:
+    """Get a streaming system for custom account parameters, reused across requests."""
+    return StreamingForexSystem(account_balance=account_balance, max_risk_per_trade=max_risk_per_trade)
+
+
+# Recent /analyze results keyed by (query, balance, risk); identical polls within the TTL reuse them
+_ANALYZE_CACHE: TTLCache = TTLCache(maxsize=1024, ttl=30)
+# One lock per in-flight key so concurrent duplicates wait for a single upstream run,
+# with the number of requests holding or waiting on it (the entry goes when it hits zero)
+_ANALYZE_LOCKS: Dict[tuple, asyncio.Lock] = {}
+_ANALYZE_LOCK_USERS: Dict[tuple, int] = {}
+
+
+def _is_cacheable(result: Dict[str, Any]) -> bool:
+    """
+    Check whether an /analyze result is safe to serve to later polls.
+
+    Results carrying node errors or an error decision (synthesis failure, the
+    all-agents-failed WAIT) are not cached, so the next request retries
+    instead of replaying a transient Gemini or network failure for the TTL.
+    """
+    decision = result.get("decision") or {}
+    return not result.get("errors") and not (decision.get("reasoning") or {}).get("error")
+
+
+@asynccontextmanager
+async def _single_flight(key: tuple):
+    """Hold the per-key /analyze lock; it is shared until its last holder or waiter leaves."""
+    lock = _ANALYZE_LOCKS.get(key)
+    if lock is None:
+        lock = _ANALYZE_LOCKS[key] = asyncio.Lock()
+    _ANALYZE_LOCK_USERS[key] = _ANALYZE_LOCK_USERS.get(key, 0) + 1
+    try:
+        async with lock:
+            yield
+    finally:
+        remaining = _ANALYZE_LOCK_USERS[key] - 1
+        if remaining:
+            _ANALYZE_LOCK_USERS[key] = remaining
+        else:
+            del _ANALYZE_LOCK_USERS[key]
+            del _ANALYZE_LOCKS[key]
+
+
+# Maximum number of already-queued SSE events coalesced into one write
+_SSE_BATCH_SIZE = 8
+_SSE_DONE = object()
+
+# Agent payloads may carry numpy values or non-string keys; json.dumps coerced the latter
+_SSE_JSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+# Keep reverse proxies (e.g. nginx) from caching or buffering the event stream
+_SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+async def _coalesce_sse(events: AsyncIterator[dict]) -> AsyncIterator[bytes]:
+    """
+    Encode SSE events and coalesce bursts into batched writes.
+
+    A pump task feeds encoded events into a queue. Each iteration waits for the
+    next event, then drains up to _SSE_BATCH_SIZE events that are already queued
+    without waiting, so bursts (e.g. agent progress updates) share one network
+    write while a lone event is sent immediately rather than held back.
+
+    Args:
+        events: Async iterator of SSE event dicts ({"event": ..., "data": ...})
+
+    Yields:
+        Encoded SSE bytes for one or more events
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=64)
+
+    async def pump():
+        # End-of-stream markers are only queued while the consumer is still reading;
+        # if it goes away it cancels this task, and nothing awaits a full queue again
+        try:
+            async for event in events:
+                await queue.put(ServerSentEvent(**event).encode())
+        except Exception as e:
+            await queue.put(e)
+        else:
+            await queue.put(_SSE_DONE)
+
+    pump_task = asyncio.create_task(pump())
+    try:
+        done, error = False, None
+        while not done:
+            batch = [await queue.get()]
+            while len(batch) < _SSE_BATCH_SIZE and not queue.empty():
+                batch.append(queue.get_nowait())
+
+            chunks = []
+            for item in batch:
+                if item is _SSE_DONE:
+                    done = True
+                    break
+                if isinstance(item, Exception):
+                    done, error = True, item
+                    break
+                chunks.append(item)
+
+            if chunks:
+                yield b"".join(chunks)
+            if error is not None:
+                raise error
+    finally:
+        pump_task.cancel()
 
 
 # Request/Response models
@@ -68,6 +213,11 @@ class AnalysisRequest(BaseModel):
     max_risk_per_trade: Optional[float] = None
 
 
+class BatchAnalysisRequest(BaseModel):
+    """Request model for batch technical analysis."""
+    pairs: List[str]
+
+
 class HealthResponse(BaseModel):
     """Health check response."""
     status: str
@@ -75,6 +225,12 @@ class HealthResponse(BaseModel):
     api_configured: bool
 
 
+@lru_cache(maxsize=2)
+def _health_bytes(api_configured: bool) -> bytes:
+    """Serialized healthy response; only two variants exist, so build each once."""
+    return orjson.dumps(HealthResponse(status="healthy", version="2.0.0", api_configured=api_configured).model_dump())
+
+
 class SocialFormatRequest(BaseModel):
     """Request model for social media formatting."""
     result: dict  # Analysis result from /analyze endpoint
@@ -102,21 +258,17 @@ async def health_check(request: Request):
     Returns system status and configuration info.
     """
     client_ip = request.client.host
-    logger.debug(f"🏥 [HEALTH] Health check from {client_ip}")
+    logger.debug("🏥 [HEALTH] Health check from %s", client_ip)
 
     try:
         system = get_system()
         info = system.get_info()
 
-        logger.debug(f"🏥 [HEALTH] System healthy, API configured: {info['system']['api_configured']}")
+        logger.debug("🏥 [HEALTH] System healthy, API configured: %s", info["system"]["api_configured"])
 
-        return HealthResponse(
-            status="healthy",
-            version="2.0.0",
-            api_configured=info["system"]["api_configured"]
-        )
+        return Response(content=_health_bytes(bool(info["system"]["api_configured"])), media_type="application/json")
     except Exception as e:
-        logger.error(f"❌ [HEALTH] Health check failed: {str(e)}")
+        logger.error("❌ [HEALTH] Health check failed: %s", e)
         return JSONResponse(
             status_code=503,
             content={
@@ -159,21 +311,53 @@ async def analyze(request: AnalysisRequest):
     Returns:
         Complete analysis result with decision and agent outputs
     """
+    key = (request.query, request.account_balance, request.max_risk_per_trade)
+    result = _ANALYZE_CACHE.get(key)
+    if result is not None:
+        return result
+
     try:
-        # Create system with custom parameters if provided
-        if request.account_balance or request.max_risk_per_trade:
-            system = StreamingForexSystem(
-                account_balance=request.account_balance,
-                max_risk_per_trade=request.max_risk_per_trade
-            )
-        else:
-            system = get_system()
+        async with _single_flight(key):
+            # A concurrent duplicate may have filled the cache while we waited
+            result = _ANALYZE_CACHE.get(key)
+            if result is not None:
+                return result
+
+            # Create system with custom parameters if provided
+            if request.account_balance or request.max_risk_per_trade:
+                system = _system_for(request.account_balance, request.max_risk_per_trade)
+            else:
+                system = get_system()
+
+            # Run analysis (non-streaming) on the event loop; duplicate requests wait on the lock
+            result = await system.system.aanalyze(request.query, verbose=False)
+            if _is_cacheable(result):
+                _ANALYZE_CACHE[key] = result
+            return result
 
-        # Run analysis (non-streaming)
-        result = system.system.analyze(request.query, verbose=False)
-        return result
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# Batch technical analysis endpoint
+@app.post("/analyze/batch")
+async def analyze_batch(request: BatchAnalysisRequest):
+    """
+    Rule-based technical analysis for several pairs at once.
+
+    All pairs share one vectorized indicator pass; no LLM calls are made.
+
+    Args:
+        request: Batch request with the pairs to analyze
 
+    Returns:
+        Technical analysis results, one per pair, in request order
+    """
+    try:
+        results = await _batch_technical_agent().analyze_batch(request.pairs)
+        return {"results": results}
     except Exception as e:
+        logger.error("❌ [API] Batch analysis failed: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -206,18 +390,19 @@ async def analyze_stream(analysis_request: AnalysisRequest, client_request: Requ
         - error: Error occurred
     """
     client_ip = client_request.client.host
-    logger.info(f"🌐 [API] POST /analyze/stream from {client_ip}")
-    logger.info(f"🌐 [API] Query: '{analysis_request.query}'")
-    start_time = time.time()
+    logger.info("🌐 [API] POST /analyze/stream from %s", client_ip)
+    logger.info("🌐 [API] Query: '%s'", analysis_request.query)
+    start_ns = time.monotonic_ns()
 
     try:
         # Create system with custom parameters if provided
         if analysis_request.account_balance or analysis_request.max_risk_per_trade:
-            logger.info(f"🌐 [API] Using custom parameters: balance={analysis_request.account_balance}, risk={analysis_request.max_risk_per_trade}")
-            system = StreamingForexSystem(
-                account_balance=analysis_request.account_balance,
-                max_risk_per_trade=analysis_request.max_risk_per_trade
+            logger.info(
+                "🌐 [API] Using custom parameters: balance=%s, risk=%s",
+                analysis_request.account_balance,
+                analysis_request.max_risk_per_trade,
             )
+            system = _system_for(analysis_request.account_balance, analysis_request.max_risk_per_trade)
         else:
             system = get_system()
 
@@ -231,31 +416,33 @@ async def analyze_stream(analysis_request: AnalysisRequest, client_request: Requ
 
                     yield {
                         "event": event_type,
-                        "data": json.dumps(event_data)
+                        "data": orjson.dumps(event_data, option=_SSE_JSON_OPTIONS).decode()
                     }
 
-                    # Small delay to prevent overwhelming the client
-                    await asyncio.sleep(0.01)
-
             except Exception as e:
-                elapsed = time.time() - start_time
-                logger.error(f"❌ [API] Stream error after {elapsed:.2f}s: {type(e).__name__}: {str(e)}")
+                elapsed = (time.monotonic_ns() - start_ns) / 1e9
+                logger.error("❌ [API] Stream error after %.2fs: %s: %s", elapsed, type(e).__name__, e)
 
                 # Send error event
                 yield {
                     "event": "error",
-                    "data": json.dumps({
+                    "data": orjson.dumps({
                         "error": str(e),
                         "error_type": type(e).__name__
-                    })
+                    }).decode()
                 }
 
-        logger.info(f"🌐 [API] Starting SSE stream for query: '{analysis_request.query}'")
-        return EventSourceResponse(event_generator())
+        logger.info("🌐 [API] Starting SSE stream for query: '%s'", analysis_request.query)
+        return EventSourceResponse(
+            _coalesce_sse(event_generator()),
+            ping=15,  # Protocol-level keep-alive comments every 15s
+            send_timeout=5,  # Drop stalled clients instead of blocking the stream
+            headers=_SSE_HEADERS,
+        )
 
     except Exception as e:
-        elapsed = time.time() - start_time
-        logger.error(f"❌ [API] Failed to start stream after {elapsed:.2f}s: {str(e)}")
+        elapsed = (time.monotonic_ns() - start_ns) / 1e9
+        logger.error("❌ [API] Failed to start stream after %.2fs: %s", elapsed, e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -358,7 +545,7 @@ async def format_social_post(request: SocialFormatRequest):
             )
 
     except Exception as e:
-        logger.error(f"❌ [FORMAT-SOCIAL] Error formatting post: {str(e)}")
+        logger.error("❌ [FORMAT-SOCIAL] Error formatting post: %s", e)
         return SocialFormatResponse(
             platform=request.platform or "unknown",
             error=str(e),
@@ -366,24 +553,28 @@ async def format_social_post(request: SocialFormatRequest):
         )
 
 
-# Root endpoint
+# Root endpoint (static payload, serialized once at import)
+_ROOT_JSON = orjson.dumps({
+    "name": "Forex Agent System API",
+    "version": "2.0.0",
+    "description": "Real-time streaming API for multi-agent forex/commodity trading analysis",
+    "endpoints": {
+        "health": "/health",
+        "info": "/info",
+        "analyze": "/analyze (POST)",
+        "batch": "/analyze/batch (POST)",
+        "stream": "/analyze/stream (POST or GET)",
+        "format-social": "/api/format-social (POST)",
+        "docs": "/docs"
+    },
+    "documentation": "/docs"
+})
+
+
 @app.get("/")
 async def root():
     """API root endpoint with documentation links."""
-    return {
-        "name": "Forex Agent System API",
-        "version": "2.0.0",
-        "description": "Real-time streaming API for multi-agent forex/commodity trading analysis",
-        "endpoints": {
-            "health": "/health",
-            "info": "/info",
-            "analyze": "/analyze (POST)",
-            "stream": "/analyze/stream (POST or GET)",
-            "format-social": "/api/format-social (POST)",
-            "docs": "/docs"
-        },
-        "documentation": "/docs"
-    }
+    return Response(content=_ROOT_JSON, media_type="application/json")
 
 
 if __name__ == "__main__":
@@ -393,14 +584,22 @@ if __name__ == "__main__":
     host = os.getenv("API_HOST", "0.0.0.0")
     port = int(os.getenv("API_PORT", "8000"))
     reload = os.getenv("API_RELOAD", "true").lower() == "true"
+    # Multiple workers can't be combined with reload. Default to one: each worker keeps its
+    # own result/node/LLM caches (splitting the dedup), and os.cpu_count() reports host
+    # cores rather than a container's CPU limit
+    workers = 1 if reload else int(os.getenv("API_WORKERS") or os.getenv("WEB_CONCURRENCY") or 1)
 
     print(f"🚀 Starting Forex Agent System API on {host}:{port}")
     print(f"📖 API Documentation: http://{host}:{port}/docs")
     print(f"🔄 Streaming Endpoint: http://{host}:{port}/analyze/stream")
 
+    # loop/http "auto" pick uvloop and httptools when installed (uvicorn[standard])
     uvicorn.run(
         "backend.server:app",
         host=host,
         port=port,
-        reload=reload
+        reload=reload,
+        workers=workers,
+        loop="auto",
+        http="auto",
     )
@@ -4,6 +4,7 @@ import json
 from typing import AsyncIterator, Dict, Any
 from system import ForexAgentSystem
 from utils.logger import get_logger, log_error
+from utils.timestamps import utc_isoformat
 
 logger = get_logger(__name__)
 
@@ -78,22 +79,8 @@ class StreamingForexSystem:
             logger.debug(f"📤 Yielding event: {start_event['type']}")
             yield start_event
 
-            # Prepare initial state
-            inputs = {
-                "user_query": query,
-                "query_context": None,
-                "pair": None,
-                "messages": [],
-                "step_count": 0,
-                "news_result": None,
-                "technical_result": None,
-                "fundamental_result": None,
-                "risk_result": None,
-                "decision": None,
-                "report_result": None,
-                "should_continue": True,
-                "errors": {},
-            }
+            # Prepare initial state (errors starts as {} on the streaming path)
+            inputs = {**self.system._initial_state(query), "errors": {}}
 
             # Track previous state to detect changes
             prev_state = {}
@@ -294,8 +281,7 @@ class StreamingForexSystem:
 
     def _get_timestamp(self) -> str:
         """Get current timestamp in ISO format."""
-        from datetime import datetime
-        return datetime.utcnow().isoformat() + "Z"
+        return utc_isoformat() + "Z"
 
     def get_info(self) -> Dict[str, Any]:
         """Get system information."""
@@ -1,6 +1,6 @@
 """LangGraph components for forex trading system."""
 
 from graph.state import ForexAgentState
-from graph.workflow import build_forex_workflow
+from graph.workflow import build_forex_workflow, build_analysis_workflow
 
-__all__ = ["ForexAgentState", "build_forex_workflow"]
+__all__ = ["ForexAgentState", "build_forex_workflow", "build_analysis_workflow"]
@@ -1,19 +1,46 @@
 """LangGraph node functions for forex agent system."""
 
+import hashlib
 import json
 import os
+import re
 import time
+from collections import OrderedDict
+from functools import lru_cache
 from typing import Dict, Any
+import orjson
 from langchain_core.runnables import RunnableConfig
 
 from graph.state import ForexAgentState
 from agents import NewsAgent, TechnicalAgent, FundamentalAgent, RiskAgent
 from agents.report_agent import ReportAgent
+from utils.gemini import get_async_client
 from utils.logger import get_logger, log_error
 
 logger = get_logger(__name__)
 
 
+# Agents hold only configuration, so each node reuses one instance instead of building it per run
+@lru_cache(maxsize=1)
+def _get_news_agent() -> NewsAgent:
+    return NewsAgent()
+
+
+@lru_cache(maxsize=1)
+def _get_technical_agent() -> TechnicalAgent:
+    return TechnicalAgent()
+
+
+@lru_cache(maxsize=1)
+def _get_fundamental_agent() -> FundamentalAgent:
+    return FundamentalAgent()
+
+
+@lru_cache(maxsize=32)
+def _get_risk_agent(account_balance: float, max_risk_per_trade: float) -> RiskAgent:
+    return RiskAgent(account_balance=account_balance, max_risk_per_trade=max_risk_per_trade)
+
+
 async def news_node(state: ForexAgentState, config: RunnableConfig) -> Dict[str, Any]:
     """
     Node: Analyze news for the currency pair using Google Search.
@@ -30,7 +57,7 @@ async def news_node(state: ForexAgentState, config: RunnableConfig) -> Dict[str,
     from langgraph.config import get_stream_writer
 
     pair = state["pair"]
-    logger.info(f"📰 [NEWS NODE] Starting analysis for {pair}")
+    logger.info("📰 [NEWS NODE] Starting analysis for %s", pair)
     start_time = time.time()
 
     try:
@@ -38,12 +65,12 @@ async def news_node(state: ForexAgentState, config: RunnableConfig) -> Dict[str,
         writer = get_stream_writer()
         writer({"agent_start": {"agent": "news", "pair": pair, "status": "starting"}})
 
-        agent = NewsAgent()
+        agent = _get_news_agent()
         result = await agent.analyze(pair, config=config)
 
         elapsed = time.time() - start_time
         success = result.get("success", False)
-        logger.info(f"📰 [NEWS NODE] Completed - Success: {success}, Time: {elapsed:.2f}s")
+        logger.info("📰 [NEWS NODE] Completed - Success: %s, Time: %.2fs", success, elapsed)
 
         return {
             "news_result": result,
@@ -52,12 +79,12 @@ async def news_node(state: ForexAgentState, config: RunnableConfig) -> Dict[str,
     except Exception as e:
         elapsed = time.time() - start_time
         log_error(logger, e, "news_node")
-        logger.error(f"📰 [NEWS NODE] Failed after {elapsed:.2f}s")
+        logger.error("📰 [NEWS NODE] Failed after %.2fs", elapsed)
 
         return {
             "news_result": {"success": False, "error": str(e)},
             "step_count": state.get("step_count", 0) + 1,
-            "errors": {**(state.get("errors") or {}), "news": str(e)},
+            "errors": {"news": str(e)},
         }
 
 
@@ -77,7 +104,7 @@ async def technical_node(state: ForexAgentState, config: RunnableConfig) -> Dict
     from langgraph.config import get_stream_writer
 
     pair = state["pair"]
-    logger.info(f"📊 [TECHNICAL NODE] Starting analysis for {pair}")
+    logger.info("📊 [TECHNICAL NODE] Starting analysis for %s", pair)
     start_time = time.time()
 
     try:
@@ -85,12 +112,12 @@ async def technical_node(state: ForexAgentState, config: RunnableConfig) -> Dict
         writer = get_stream_writer()
         writer({"agent_start": {"agent": "technical", "pair": pair, "status": "starting"}})
 
-        agent = TechnicalAgent()
+        agent = _get_technical_agent()
         result = await agent.analyze(pair, config=config)
 
         elapsed = time.time() - start_time
         success = result.get("success", False)
-        logger.info(f"📊 [TECHNICAL NODE] Completed - Success: {success}, Time: {elapsed:.2f}s")
+        logger.info("📊 [TECHNICAL NODE] Completed - Success: %s, Time: %.2fs", success, elapsed)
 
         return {
             "technical_result": result,
@@ -99,12 +126,12 @@ async def technical_node(state: ForexAgentState, config: RunnableConfig) -> Dict
     except Exception as e:
         elapsed = time.time() - start_time
         log_error(logger, e, "technical_node")
-        logger.error(f"📊 [TECHNICAL NODE] Failed after {elapsed:.2f}s")
+        logger.error("📊 [TECHNICAL NODE] Failed after %.2fs", elapsed)
 
         return {
             "technical_result": {"success": False, "error": str(e)},
             "step_count": state["step_count"] + 1,
-            "errors": {**(state.get("errors") or {}), "technical": str(e)},
+            "errors": {"technical": str(e)},
         }
 
 
@@ -124,7 +151,7 @@ async def fundamental_node(state: ForexAgentState, config: RunnableConfig) -> Di
     from langgraph.config import get_stream_writer
 
     pair = state["pair"]
-    logger.info(f"💼 [FUNDAMENTAL NODE] Starting analysis for {pair}")
+    logger.info("💼 [FUNDAMENTAL NODE] Starting analysis for %s", pair)
     start_time = time.time()
 
     try:
@@ -132,12 +159,12 @@ async def fundamental_node(state: ForexAgentState, config: RunnableConfig) -> Di
         writer = get_stream_writer()
         writer({"agent_start": {"agent": "fundamental", "pair": pair, "status": "starting"}})
 
-        agent = FundamentalAgent()
+        agent = _get_fundamental_agent()
         result = await agent.analyze(pair, config=config)
 
         elapsed = time.time() - start_time
         success = result.get("success", False)
-        logger.info(f"💼 [FUNDAMENTAL NODE] Completed - Success: {success}, Time: {elapsed:.2f}s")
+        logger.info("💼 [FUNDAMENTAL NODE] Completed - Success: %s, Time: %.2fs", success, elapsed)
 
         return {
             "fundamental_result": result,
@@ -146,11 +173,11 @@ async def fundamental_node(state: ForexAgentState, config: RunnableConfig) -> Di
     except Exception as e:
         elapsed = time.time() - start_time
         log_error(logger, e, "fundamental_node")
-        logger.error(f"💼 [FUNDAMENTAL NODE] Failed after {elapsed:.2f}s")
+        logger.error("💼 [FUNDAMENTAL NODE] Failed after %.2fs", elapsed)
         return {
             "fundamental_result": {"success": False, "error": str(e)},
             "step_count": state["step_count"] + 1,
-            "errors": {**(state.get("errors") or {}), "fundamental": str(e)},
+            "errors": {"fundamental": str(e)},
         }
 
 
@@ -168,14 +195,14 @@ async def risk_node(state: ForexAgentState, config: RunnableConfig) -> Dict[str,
         State updates
     """
     pair = state["pair"]
-    print(f"⚖️  Risk Agent calculating parameters (advisory only)...")
+    logger.info("⚖️  Risk Agent calculating parameters for %s (advisory only)...", pair)
 
     try:
         # Get technical analysis results for entry/stop prices
         ta_result = state.get("technical_result", {})
         if not ta_result.get("success"):
             # If technical analysis failed, return advisory-only result
-            print("⚠️  Technical analysis failed - risk assessment unavailable (advisory only)")
+            logger.warning("⚠️  Technical analysis failed - risk assessment unavailable (advisory only)")
             return {
                 "risk_result": {
                     "success": False,
@@ -191,7 +218,7 @@ async def risk_node(state: ForexAgentState, config: RunnableConfig) -> Dict[str,
 
         # Validate required data
         if not current_price or not stop_loss:
-            print("⚠️  Missing price/stop loss - risk assessment unavailable (advisory only)")
+            logger.warning("⚠️  Missing price/stop loss - risk assessment unavailable (advisory only)")
             return {
                 "risk_result": {
                     "success": False,
@@ -208,12 +235,16 @@ async def risk_node(state: ForexAgentState, config: RunnableConfig) -> Dict[str,
         # Get take profit
         take_profit = ta_data.get("take_profit")
 
-        # Get account settings from environment or use defaults
-        account_balance = float(os.getenv("ACCOUNT_BALANCE", "10000.0"))
-        max_risk = float(os.getenv("MAX_RISK_PER_TRADE", "0.02"))
+        # Get account settings from state, else environment or defaults
+        account_balance = state.get("account_balance")
+        if account_balance is None:
+            account_balance = float(os.getenv("ACCOUNT_BALANCE", "10000.0"))
+        max_risk = state.get("max_risk_per_trade")
+        if max_risk is None:
+            max_risk = float(os.getenv("MAX_RISK_PER_TRADE", "0.02"))
 
-        # Initialize risk agent
-        agent = RiskAgent(account_balance=account_balance, max_risk_per_trade=max_risk)
+        # Risk agent for these account settings (cached per pair of values)
+        agent = _get_risk_agent(account_balance, max_risk)
 
         # Analyze risk
         result = await agent.analyze(
@@ -225,7 +256,7 @@ async def risk_node(state: ForexAgentState, config: RunnableConfig) -> Dict[str,
             "step_count": state["step_count"] + 1,
         }
     except Exception as e:
-        print(f"⚠️  Risk calculation error: {str(e)} (advisory only)")
+        logger.warning("⚠️  Risk calculation error: %s (advisory only)", e)
         return {
             "risk_result": {
                 "success": False,
@@ -233,11 +264,11 @@ async def risk_node(state: ForexAgentState, config: RunnableConfig) -> Dict[str,
                 "data": {"trade_approved": False, "rejection_reason": f"Risk calculation error: {str(e)}"},
             },
             "step_count": state["step_count"] + 1,
-            "errors": {**(state.get("errors") or {}), "risk": str(e)},
+            "errors": {"risk": str(e)},
         }
 
 
-def synthesis_node(state: ForexAgentState, config: RunnableConfig) -> Dict[str, Any]:
+async def synthesis_node(state: ForexAgentState, config: RunnableConfig) -> Dict[str, Any]:
     """
     Node: Synthesize all agent outputs using Gemini LLM.
 
@@ -257,26 +288,37 @@ def synthesis_node(state: ForexAgentState, config: RunnableConfig) -> Dict[str,
     from langgraph.config import get_stream_writer
 
     pair = state["pair"]
-    print(f"🤖 Synthesis Agent making final decision...")
+    logger.info("🤖 Synthesis Agent making final decision for %s...", pair)
 
     try:
         # Get stream writer for progress updates
         writer = get_stream_writer()
         writer({"agent_progress": {"agent": "synthesis", "step": "collecting_data", "message": "Collecting all agent results"}})
 
-        from google import genai
         from google.genai import types
 
         # Emit progress: Building synthesis
         writer({"agent_progress": {"agent": "synthesis", "step": "building_synthesis", "message": "Building comprehensive analysis"}})
 
 
-        # Initialize Gemini client
+        # Identical agent outputs replay the earlier decision without another LLM call
+        cache_key = _synthesis_cache_key(state)
+        cached_text = _SYNTHESIS_CACHE.get(cache_key)
+        if cached_text is not None:
+            _SYNTHESIS_CACHE.move_to_end(cache_key)
+            decision = json.loads(cached_text)
+            logger.info("✅ Final decision (cached): %s", decision.get("action", "UNKNOWN"))
+            return {
+                "decision": decision,
+                "step_count": state["step_count"] + 1,
+            }
+
+        # Reuse the cached Gemini client
         api_key = os.getenv("GOOGLE_AI_API_KEY")
         if not api_key:
             raise ValueError("GOOGLE_AI_API_KEY not found in environment")
 
-        client = genai.Client(api_key=api_key)
+        client = get_async_client(api_key)
 
         # Build comprehensive prompt
         prompt = _build_synthesis_prompt(state)
@@ -291,16 +333,36 @@ def synthesis_node(state: ForexAgentState, config: RunnableConfig) -> Dict[str,
         # Emit progress: Analyzing
         writer({"agent_progress": {"agent": "synthesis", "step": "analyzing", "message": "Analyzing all agent data for final decision"}})
 
-        # Generate decision
-        response = client.models.generate_content(model="gemini-2.5-flash", contents=[prompt], config=config_gemini)
+        # Stream the decision; "action" is the first output field, so it is announced
+        # as soon as it appears instead of after the whole JSON has arrived
+        chunks = []
+        action = None
+        async for chunk in await client.aio.models.generate_content_stream(
+            model="gemini-2.5-flash", contents=[prompt], config=config_gemini
+        ):
+            chunks.append(chunk.text or "")
+            if action is None:
+                match = _ACTION_PATTERN.search("".join(chunks))
+                if match:
+                    action = match.group(1)
+                    writer({"agent_progress": {
+                        "agent": "synthesis",
+                        "step": "action_detected",
+                        "message": f"Decision: {action}",
+                        "intermediate_data": {"action": action},
+                    }})
+        response_text = "".join(chunks)
 
         # Emit progress: Processing decision
         writer({"agent_progress": {"agent": "synthesis", "step": "processing_decision", "message": "Processing final trading decision"}})
 
-        # Parse decision
-        decision = json.loads(response.text)
+        # Parse decision; only parseable responses are cached
+        decision = json.loads(response_text)
+        _SYNTHESIS_CACHE[cache_key] = response_text
+        if len(_SYNTHESIS_CACHE) > _SYNTHESIS_CACHE_SIZE:
+            _SYNTHESIS_CACHE.popitem(last=False)
 
-        print(f"✅ Final decision: {decision.get('action', 'UNKNOWN')}")
+        logger.info("✅ Final decision: %s", decision.get("action", "UNKNOWN"))
 
         return {
             "decision": decision,
@@ -308,7 +370,7 @@ def synthesis_node(state: ForexAgentState, config: RunnableConfig) -> Dict[str,
         }
 
     except Exception as e:
-        print(f"❌ Synthesis failed: {str(e)}")
+        logger.error("❌ Synthesis failed: %s", e)
         # Fallback decision
         return {
             "decision": {
@@ -317,37 +379,64 @@ def synthesis_node(state: ForexAgentState, config: RunnableConfig) -> Dict[str,
                 "reasoning": {"summary": f"Synthesis failed: {str(e)}", "error": True},
             },
             "step_count": state["step_count"] + 1,
-            "errors": {**(state.get("errors") or {}), "synthesis": str(e)},
+            "errors": {"synthesis": str(e)},
         }
 
 
-def _build_synthesis_prompt(state: ForexAgentState) -> str:
-    """Build the synthesis prompt for Gemini."""
-    pair = state["pair"]
+# Agent payloads may carry numpy values or non-string keys (json.dumps coerced the latter)
+_PROMPT_JSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
 
-    # Extract agent results
-    news_data = state.get("news_result", {}).get("data", {})
-    tech_data = state.get("technical_result", {}).get("data", {})
-    fund_data = state.get("fundamental_result", {}).get("data", {})
-    risk_data = state.get("risk_result", {}).get("data", {})
+# Generation config of synthesis_node in REST form, for Gemini Batch API requests
+SYNTHESIS_BATCH_CONFIG = {
+    "temperature": 0.3,
+    "response_mime_type": "application/json",
+    "thinking_config": {"thinking_budget": 0},
+}
+
+# "action" field of a (possibly partial) streamed synthesis response
+_ACTION_PATTERN = re.compile(r'"action"\s*:\s*"(BUY|SELL|WAIT)"')
+
+# Synthesis responses (raw JSON text) by hash of the agent data, least recently used evicted first
+_SYNTHESIS_CACHE_SIZE = 256
+_SYNTHESIS_CACHE: "OrderedDict[str, str]" = OrderedDict()
+
+# Per-run timing fields that differ on every run but don't inform the decision
+_VOLATILE_KEYS = frozenset({"execution_time", "execution_start_time", "execution_end_time", "analysis_timestamp", "timestamp"})
+_CACHE_KEY_OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _synthesis_cache_key(state: ForexAgentState) -> str:
+    """Stable hash of the pair and the agent data the synthesis prompt is built from."""
+    blobs = [state["pair"]]
+    for key in ("news_result", "technical_result", "fundamental_result", "risk_result"):
+        data = (state.get(key) or {}).get("data") or {}
+        blobs.append({k: v for k, v in data.items() if k not in _VOLATILE_KEYS})
+    return hashlib.blake2b(orjson.dumps(blobs, option=_CACHE_KEY_OPTIONS), digest_size=16).hexdigest()
 
-    prompt = f"""You are an expert forex trading synthesizer. Analyze the following agent data to make a final trading decision.
+
+def _dump_indented(data: Any) -> str:
+    """Serialize agent data as indented JSON for prompts (orjson, C-implemented)."""
+    return orjson.dumps(data, option=_PROMPT_JSON_OPTIONS).decode()
+
+
+# Synthesis prompt; filled with str.format_map, so literal JSON braces are doubled
+_SYNTHESIS_TEMPLATE = """You are an expert forex trading synthesizer. Analyze the following agent data to make a final trading decision.
 
 CURRENCY PAIR: {pair}
 
 AGENT ANALYSIS:
 
 📰 NEWS AGENT:
-{json.dumps(news_data, indent=2)}
+{news_json}
 
 📊 TECHNICAL AGENT:
-{json.dumps(tech_data, indent=2)}
+{tech_json}
 
 💰 FUNDAMENTAL AGENT:
-{json.dumps(fund_data, indent=2)}
+{fund_json}
 
 ⚖️  RISK AGENT (ADVISORY ONLY):
-{json.dumps(risk_data, indent=2)}
+{risk_json}
 
 TASK:
 1. Analyze all agent outputs comprehensively
@@ -375,10 +464,10 @@ OUTPUT FORMAT (JSON):
     "risk_advisory": "Note any concerns from Risk Agent if trade_approved=false"
   }},
   "trade_parameters": {{
-    "entry_price": {tech_data.get('current_price', 0)},
-    "stop_loss": {tech_data.get('stop_loss', 0)},
-    "take_profit": {tech_data.get('take_profit', 0)},
-    "position_size": {risk_data.get('position_size', 0)}
+    "entry_price": {entry_price},
+    "stop_loss": {stop_loss},
+    "take_profit": {take_profit},
+    "position_size": {position_size}
   }},
   "disclaimer": "Risk assessment and position sizing are for informational purposes only. Always conduct your own research and consult with a financial advisor before trading."
 }}
@@ -386,7 +475,26 @@ OUTPUT FORMAT (JSON):
 Remember: Be conservative. When in doubt, output "WAIT".
 """
 
-    return prompt
+
+def _build_synthesis_prompt(state: ForexAgentState) -> str:
+    """Build the synthesis prompt for Gemini."""
+    # Extract agent results
+    news_data = state.get("news_result", {}).get("data", {})
+    tech_data = state.get("technical_result", {}).get("data", {})
+    fund_data = state.get("fundamental_result", {}).get("data", {})
+    risk_data = state.get("risk_result", {}).get("data", {})
+
+    return _SYNTHESIS_TEMPLATE.format_map({
+        "pair": state["pair"],
+        "news_json": _dump_indented(news_data),
+        "tech_json": _dump_indented(tech_data),
+        "fund_json": _dump_indented(fund_data),
+        "risk_json": _dump_indented(risk_data),
+        "entry_price": tech_data.get("current_price", 0),
+        "stop_loss": tech_data.get("stop_loss", 0),
+        "take_profit": tech_data.get("take_profit", 0),
+        "position_size": risk_data.get("position_size", 0),
+    })
 
 
 async def report_node(state: ForexAgentState, config: RunnableConfig) -> Dict[str, Any]:
@@ -406,7 +514,7 @@ async def report_node(state: ForexAgentState, config: RunnableConfig) -> Dict[st
     from langgraph.config import get_stream_writer
 
     pair = state["pair"]
-    print(f"📄 Report Agent generating comprehensive report...")
+    logger.info("📄 Report Agent generating comprehensive report for %s...", pair)
 
     try:
         # Get stream writer for progress updates
@@ -446,9 +554,9 @@ async def report_node(state: ForexAgentState, config: RunnableConfig) -> Dict[st
 
         success = result.get("success", False)
         if success:
-            print(f"✅ Report generated successfully ({result.get('metadata', {}).get('word_count', 0)} words)")
+            logger.info("✅ Report generated successfully (%s words)", result.get("metadata", {}).get("word_count", 0))
         else:
-            print(f"⚠️  Report generation failed: {result.get('error', 'Unknown error')}")
+            logger.warning("⚠️  Report generation failed: %s", result.get("error", "Unknown error"))
 
         return {
             "report_result": result,
@@ -456,7 +564,7 @@ async def report_node(state: ForexAgentState, config: RunnableConfig) -> Dict[st
         }
 
     except Exception as e:
-        print(f"❌ Report generation error: {str(e)}")
+        logger.error("❌ Report generation error: %s", e)
         return {
             "report_result": {
                 "success": False,
@@ -465,31 +573,62 @@ async def report_node(state: ForexAgentState, config: RunnableConfig) -> Dict[st
                 "html": None,
             },
             "step_count": state["step_count"] + 1,
-            "errors": {**(state.get("errors") or {}), "report": str(e)},
+            "errors": {"report": str(e)},
         }
 
 
+# Results synthesis needs at least one of (risk is advisory and not counted)
+_ANALYSIS_RESULT_KEYS = ("news_result", "technical_result", "fundamental_result")
+
+
+def insufficient_data_node(state: ForexAgentState, config: RunnableConfig) -> Dict[str, Any]:
+    """
+    Node: WAIT decision when every analysis agent failed, without calling Gemini.
+
+    Args:
+        state: Current graph state
+        config: Runtime configuration
+
+    Returns:
+        State updates with a fallback decision
+    """
+    return {
+        "decision": {
+            "action": "WAIT",
+            "confidence": 0.0,
+            "reasoning": {"summary": "All analysis agents failed - insufficient data for a decision", "error": True},
+        },
+        "step_count": state["step_count"] + 1,
+    }
+
+
 # Conditional edge functions
 def should_continue_after_risk(state: ForexAgentState) -> str:
     """
     Determine if we should continue to synthesis after risk analysis.
 
-    IMPORTANT: Risk is now ADVISORY ONLY - we always continue to synthesis.
+    IMPORTANT: Risk is now ADVISORY ONLY - it never stops the workflow.
     The synthesis agent will consider risk assessment but won't be blocked by it.
+    The only early exit is when news, technical and fundamental all failed,
+    since synthesis would have no market data to work from.
     """
+    if all(not (state.get(key) or {}).get("success") for key in _ANALYSIS_RESULT_KEYS):
+        logger.warning("⚠️  All analysis agents failed - skipping synthesis")
+        return "insufficient_data"
+
     risk_result = state.get("risk_result", {})
 
     if not risk_result.get("success", False):
-        print("⚠️  Risk analysis failed, but continuing (risk is advisory only)")
+        logger.warning("⚠️  Risk analysis failed, but continuing (risk is advisory only)")
         return "continue"
 
     risk_data = risk_result.get("data", {})
     if not risk_data.get("trade_approved", False):
-        print(f"⚠️  Trade flagged by Risk Agent: {risk_data.get('rejection_reason')}")
-        print("   (Risk is advisory only - continuing to synthesis)")
+        logger.warning("⚠️  Trade flagged by Risk Agent: %s", risk_data.get("rejection_reason"))
+        logger.info("   (Risk is advisory only - continuing to synthesis)")
         return "continue"
 
-    print("✅ Risk approved, proceeding to synthesis")
+    logger.info("✅ Risk approved, proceeding to synthesis")
     return "continue"
 
 
@@ -502,7 +641,7 @@ def route_after_synthesis(state: ForexAgentState) -> str:
     decision = state.get("decision", {})
     action = decision.get("action", "WAIT")
 
-    print(f"🎯 Routing after synthesis: {action} → Generating report")
+    logger.info("🎯 Routing after synthesis: %s → Generating report", action)
     return "report"
 
 
@@ -515,5 +654,5 @@ def route_after_report(state: ForexAgentState) -> str:
     report_result = state.get("report_result", {})
     success = report_result.get("success", False)
 
-    print(f"🎯 Routing after report: {'Success' if success else 'Failed'} → End")
+    logger.info("🎯 Routing after report: %s → End", "Success" if success else "Failed")
     return "end"
@@ -1,17 +1,99 @@
 """Parallel execution node for running multiple agents simultaneously using asyncio."""
 
 import asyncio
+import copy
 import time
 from typing import Dict, Any
+from cachetools import TTLCache
 from langchain_core.runnables import RunnableConfig
 
 from graph.state import ForexAgentState
 from graph.nodes import news_node, technical_node, fundamental_node
 from utils.logger import get_logger, log_error
+from utils.stream import get_writer
+from utils.timestamps import replay_result
 
 logger = get_logger(__name__)
 
 
+# Agents fanned out by parallel_analysis_node, in gather order; each writes "<agent>_result"
+_AGENTS = ("news", "technical", "fundamental")
+
+# Successful agent results per pair, each kept as long as its inputs stay current:
+# prices move within a minute, macro data over hours. News isn't listed because
+# NewsAgent keeps its own 5-minute cache of the grounded search.
+_AGENT_CACHE_TTLS = {"technical": 60, "fundamental": 900}
+_AGENT_CACHES = {agent: TTLCache(maxsize=256, ttl=ttl) for agent, ttl in _AGENT_CACHE_TTLS.items()}
+
+
+async def _run_agent(agent: str, node, state: ForexAgentState, config: RunnableConfig) -> Dict[str, Any]:
+    """
+    Run an agent node, answering repeat pairs from that agent's result cache.
+
+    Only successful results are cached, so a failed run is retried on the
+    next request instead of being replayed for the whole TTL.
+
+    Args:
+        agent: Agent name ("news", "technical", "fundamental")
+        node: Agent node coroutine function
+        state: Current graph state
+        config: Runtime configuration
+
+    Returns:
+        State update dict for the agent
+    """
+    cache = _AGENT_CACHES.get(agent)
+    if cache is None:
+        return await node(state, config)
+
+    pair = state.get("pair", "UNKNOWN")
+    start_time = time.time()
+    cached = cache.get(pair)
+    if cached is not None:
+        logger.info("⚡ [PARALLEL NODE] %s result for %s served from cache", agent.capitalize(), pair)
+        writer = get_writer()
+        writer({"agent_start": {"agent": agent, "pair": pair, "status": "starting"}})
+        writer({"agent_progress": {
+            "agent": agent,
+            "step": "complete",
+            "message": f"{agent.capitalize()} analysis served from cache",
+            "progress_percentage": 100,
+        }})
+        return {
+            f"{agent}_result": replay_result(cached, start_time),
+            "step_count": state.get("step_count", 0) + 1,
+        }
+
+    update = await node(state, config)
+    result = update.get(f"{agent}_result") or {}
+    if result.get("success") and not update.get("errors"):
+        cache[pair] = copy.deepcopy(result)
+    return update
+
+
+def _normalize(update: Any, agent: str, state: ForexAgentState) -> Dict[str, Any]:
+    """
+    Return an agent node's state update, or a failed-agent update if it raised.
+
+    Args:
+        update: Node return value or the exception gathered in its place
+        agent: Agent name ("news", "technical", "fundamental")
+        state: Current graph state
+
+    Returns:
+        State update dict for the agent
+    """
+    if not isinstance(update, Exception):
+        return update
+
+    logger.warning("⚠️  %s agent failed: %s", agent.capitalize(), update)
+    return {
+        f"{agent}_result": {"success": False, "error": str(update)},
+        "step_count": state.get("step_count", 0) + 1,
+        "errors": {agent: str(update)},
+    }
+
+
 async def parallel_analysis_node(state: ForexAgentState, config: RunnableConfig) -> Dict[str, Any]:
     """
     Execute News, Technical, and Fundamental agents in parallel using asyncio.
@@ -32,105 +114,59 @@ async def parallel_analysis_node(state: ForexAgentState, config: RunnableConfig)
         State updates with all three agent results
     """
     pair = state.get("pair", "UNKNOWN")
-    logger.info(f"⚡ [PARALLEL NODE] Starting parallel analysis for {pair}")
+    logger.info("⚡ [PARALLEL NODE] Starting parallel analysis for %s", pair)
     logger.info("⚡ [PARALLEL NODE] Launching 3 agents concurrently: News, Technical, Fundamental")
     start_time = time.time()
 
-    try:
-        # Run all agents concurrently with asyncio.gather()
-        results = await asyncio.gather(
-            news_node(state, config),
-            technical_node(state, config),
-            fundamental_node(state, config),
-            return_exceptions=True  # Don't fail entire operation if one agent fails
-        )
+    # Run all agents concurrently; return_exceptions=True means gather itself never raises
+    results = await asyncio.gather(
+        _run_agent("news", news_node, state, config),
+        _run_agent("technical", technical_node, state, config),
+        _run_agent("fundamental", fundamental_node, state, config),
+        return_exceptions=True  # Don't fail entire operation if one agent fails
+    )
+
+    elapsed = time.time() - start_time
+    logger.info("⚡ [PARALLEL NODE] All agents completed in %.2fs", elapsed)
 
-        elapsed = time.time() - start_time
-        logger.info(f"⚡ [PARALLEL NODE] All agents completed in {elapsed:.2f}s")
-
-        news_update, technical_update, fundamental_update = results
-
-        # Handle exceptions from individual agents
-        if isinstance(news_update, Exception):
-            print(f"  ⚠️  News agent failed: {str(news_update)}")
-            news_update = {
-                "news_result": {"success": False, "error": str(news_update)},
-                "step_count": state.get("step_count", 0) + 1,
-                "errors": {"news": str(news_update)},
-            }
-
-        if isinstance(technical_update, Exception):
-            print(f"  ⚠️  Technical agent failed: {str(technical_update)}")
-            technical_update = {
-                "technical_result": {"success": False, "error": str(technical_update)},
-                "step_count": state.get("step_count", 0) + 1,
-                "errors": {"technical": str(technical_update)},
-            }
-
-        if isinstance(fundamental_update, Exception):
-            print(f"  ⚠️  Fundamental agent failed: {str(fundamental_update)}")
-            fundamental_update = {
-                "fundamental_result": {"success": False, "error": str(fundamental_update)},
-                "step_count": state.get("step_count", 0) + 1,
-                "errors": {"fundamental": str(fundamental_update)},
-            }
+    try:
+        updates = [_normalize(update, agent, state) for update, agent in zip(results, _AGENTS)]
 
         # Merge results
         # Note: step_count will be incremented by each agent,
         # so we take the max to avoid counting multiple times
-        max_steps = max(
-            news_update.get("step_count", 0) if isinstance(news_update, dict) else 0,
-            technical_update.get("step_count", 0) if isinstance(technical_update, dict) else 0,
-            fundamental_update.get("step_count", 0) if isinstance(fundamental_update, dict) else 0,
-        )
+        max_steps = max(update.get("step_count", 0) for update in updates)
+
+        # Merge errors if any (later agents win on duplicate keys, as before)
+        errors = {
+            name: error
+            for update in updates
+            if isinstance(update.get("errors"), dict)
+            for name, error in update["errors"].items()
+        }
 
-        # Merge errors if any
-        errors = {}
-        if isinstance(news_update, dict) and news_update.get("errors"):
-            if isinstance(news_update["errors"], dict):
-                errors.update(news_update["errors"])
-        if isinstance(technical_update, dict) and technical_update.get("errors"):
-            if isinstance(technical_update["errors"], dict):
-                errors.update(technical_update["errors"])
-        if isinstance(fundamental_update, dict) and fundamental_update.get("errors"):
-            if isinstance(fundamental_update["errors"], dict):
-                errors.update(fundamental_update["errors"])
-
-        logger.info(f"✅ [PARALLEL NODE] Parallel analysis complete - All 3 agents finished")
-        logger.debug(f"⚡ [PARALLEL NODE] Results: News={news_update is not Exception}, Tech={technical_update is not Exception}, Fund={fundamental_update is not Exception}")
+        merged = {
+            f"{agent}_result": update.get(f"{agent}_result")
+            for agent, update in zip(_AGENTS, updates)
+        }
+
+        logger.info("✅ [PARALLEL NODE] Parallel analysis complete - All 3 agents finished")
+        logger.debug(
+            "⚡ [PARALLEL NODE] Results: News=%s, Tech=%s, Fund=%s",
+            *((result or {}).get("success", False) for result in merged.values()),
+        )
 
         return {
-            "news_result": news_update.get("news_result"),
-            "technical_result": technical_update.get("technical_result"),
-            "fundamental_result": fundamental_update.get("fundamental_result"),
+            **merged,
             "step_count": max_steps,
             "errors": errors if errors else None,
         }
 
     except Exception as e:
-        elapsed = time.time() - start_time
+        # Safety net for merge bugs only: report the failure, don't re-run the agents
         log_error(logger, e, "parallel_analysis_node")
-        logger.error(f"❌ [PARALLEL NODE] Async parallel execution failed after {elapsed:.2f}s")
-
-        # Fall back to sequential execution
-        logger.warning(f"⚠️  [PARALLEL NODE] Falling back to sequential async execution...")
-
-        try:
-            news_update = await news_node(state, config)
-            state_with_news = {**state, **news_update}
-
-            technical_update = await technical_node(state_with_news, config)
-            state_with_tech = {**state_with_news, **technical_update}
-
-            fundamental_update = await fundamental_node(state_with_tech, config)
-
-            return {
-                "news_result": news_update.get("news_result"),
-                "technical_result": technical_update.get("technical_result"),
-                "fundamental_result": fundamental_update.get("fundamental_result"),
-                "step_count": fundamental_update.get("step_count", 0),
-                "errors": {**(state.get("errors") or {}), "parallel_execution": str(e)},
-            }
-        except Exception as sequential_error:
-            print(f"  ❌ Sequential fallback also failed: {str(sequential_error)}")
-            raise
+        return {
+            **{f"{agent}_result": {"success": False, "error": str(e)} for agent in _AGENTS},
+            "step_count": state.get("step_count", 0) + 1,
+            "errors": {"parallel_execution": str(e)},
+        }
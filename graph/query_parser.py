@@ -1,16 +1,25 @@
 """Query Parser Node - Transforms natural language to structured context."""
 
-import json
+import copy
 import os
 import time
 from typing import Dict, Any
+from cachetools import TTLCache
 from langchain_core.runnables import RunnableConfig
 
 from graph.state import ForexAgentState
+from utils.gemini import get_client
+from utils.llm_cache import generate_json
 from utils.logger import get_logger, log_error
 
 logger = get_logger(__name__)
 
+# Successful parses per query text. Kept short: the parse itself is stable, but a
+# cached context would otherwise outlive parser prompt or model changes for hours.
+# Fallback parses are never cached, so a transient Gemini failure isn't replayed.
+_PARSE_CACHE_TTL = 300
+_PARSE_CACHE: TTLCache = TTLCache(maxsize=512, ttl=_PARSE_CACHE_TTL)
+
 
 def query_parser_node(state: ForexAgentState, config: RunnableConfig) -> Dict[str, Any]:
     """
@@ -47,15 +56,24 @@ def query_parser_node(state: ForexAgentState, config: RunnableConfig) -> Dict[st
         writer = get_stream_writer()
         writer({"agent_progress": {"agent": "query_parser", "step": "parsing", "message": f"Parsing query: '{user_query}'"}})
 
-        from google import genai
+        cached = _PARSE_CACHE.get(user_query)
+        if cached is not None:
+            logger.info(f"✅ [QUERY PARSER] Using cached parse (< {_PARSE_CACHE_TTL}s old): {cached.get('pair', 'EUR/USD')}")
+            writer({"agent_progress": {"agent": "query_parser", "step": "complete", "message": "Query parse served from cache"}})
+            return {
+                "query_context": copy.deepcopy(cached),
+                "pair": cached.get("pair", "EUR/USD"),
+                "step_count": state.get("step_count", 0) + 1,
+            }
+
         from google.genai import types
 
-        # Initialize Gemini client
+        # Reuse the cached Gemini client
         api_key = os.getenv("GOOGLE_AI_API_KEY")
         if not api_key:
             raise ValueError("GOOGLE_AI_API_KEY not found in environment")
 
-        client = genai.Client(api_key=api_key)
+        client = get_client(api_key)
 
         # Build parser prompt
         prompt = _build_parser_prompt(user_query)
@@ -66,15 +84,8 @@ def query_parser_node(state: ForexAgentState, config: RunnableConfig) -> Dict[st
             response_mime_type="application/json",
         )
 
-        # Parse query
-        response = client.models.generate_content(
-            model="gemini-2.5-flash",
-            contents=[prompt],
-            config=config_gemini,
-        )
-
-        # Parse response
-        query_context = json.loads(response.text)
+        # Parse query (with LLM_CACHE=sqlite, repeat queries are reused across runs)
+        query_context = generate_json(client, "gemini-2.5-flash", prompt, config_gemini)
 
         # Set backwards-compatible pair field
         pair = query_context.get("pair", "EUR/USD")
@@ -86,6 +97,8 @@ def query_parser_node(state: ForexAgentState, config: RunnableConfig) -> Dict[st
         logger.info(f"   Intent: {query_context.get('user_intent', 'unknown')}")
         logger.debug(f"   Full context: {query_context}")
 
+        _PARSE_CACHE[user_query] = copy.deepcopy(query_context)
+
         return {
             "query_context": query_context,
             "pair": pair,  # For backwards compatibility
@@ -109,7 +122,7 @@ def query_parser_node(state: ForexAgentState, config: RunnableConfig) -> Dict[st
             },
             "pair": fallback_pair,
             "step_count": state.get("step_count", 0) + 1,
-            "errors": {**(state.get("errors") or {}), "query_parser": str(e)},
+            "errors": {"query_parser": str(e)},
         }
 
 
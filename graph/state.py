@@ -5,6 +5,20 @@ from langchain_core.messages import BaseMessage
 from langgraph.graph.message import add_messages
 
 
+def merge_errors(left: Optional[Dict[str, str]], right: Optional[Dict[str, str]]) -> Optional[Dict[str, str]]:
+    """
+    Reducer for the errors channel: merge a node's new errors into the existing ones.
+
+    Nodes return only their own entries (e.g. {"news": "..."}), so no node has to
+    copy the accumulated error dict; an empty or None update leaves it unchanged.
+    """
+    if not right:
+        return left
+    if not left:
+        return right
+    return {**left, **right}
+
+
 class ForexAgentState(TypedDict):
     """
     State for multi-agent forex analysis using LangGraph.
@@ -61,9 +75,13 @@ class ForexAgentState(TypedDict):
     #   "error": str | None
     # }
 
+    # Account settings for this run (risk node falls back to env when absent)
+    account_balance: Optional[float]
+    max_risk_per_trade: Optional[float]
+
     # Metadata
     step_count: int
     should_continue: bool
 
-    # Error tracking
-    errors: Optional[Dict[str, str]]
+    # Error tracking (merged across nodes by merge_errors)
+    errors: Annotated[Optional[Dict[str, str]], merge_errors]
@@ -11,6 +11,7 @@ from graph.nodes import (
     should_continue_after_risk,
     route_after_synthesis,
     route_after_report,
+    insufficient_data_node,
 )
 
 
@@ -22,7 +23,7 @@ def build_forex_workflow():
     1. Query Parser: Natural language → Structured JSON context
     2. Parallel Analysis: News + Technical + Fundamental (simultaneous)
     3. Risk Assessment: Advisory analysis of trade parameters (non-blocking)
-    4. Synthesis: Gemini + Google Search for final decision (always runs)
+    4. Synthesis: Gemini + Google Search for final decision (skipped if all agents failed)
     5. Report Generation: LLM-powered PDF-ready HTML report
     6. End
 
@@ -46,6 +47,7 @@ def build_forex_workflow():
     workflow.add_node("risk", risk_node)
     workflow.add_node("synthesis", synthesis_node)
     workflow.add_node("report", report_node)
+    workflow.add_node("insufficient_data", insufficient_data_node)
 
     # Set entry point - starts with query parsing
     workflow.set_entry_point("query_parser")
@@ -55,17 +57,21 @@ def build_forex_workflow():
     workflow.add_edge("parallel_analysis", "risk")
 
     # Conditional edge after risk assessment
-    # Risk is ADVISORY ONLY - always continue to synthesis
+    # Risk is ADVISORY ONLY - continue to synthesis unless every analysis agent failed
     # The synthesis agent considers risk but won't be blocked by it
     workflow.add_conditional_edges(
         "risk",
         should_continue_after_risk,
         {
             "continue": "synthesis",
+            "insufficient_data": "insufficient_data",
             "end": END,  # Never reached - kept for API compatibility
         },
     )
 
+    # No usable analysis: fixed WAIT decision, no synthesis call or report
+    workflow.add_edge("insufficient_data", END)
+
     # After synthesis, route to report generation
     workflow.add_conditional_edges(
         "synthesis",
@@ -90,6 +96,42 @@ def build_forex_workflow():
     return app
 
 
+def build_analysis_workflow():
+    """
+    Build the analysis-only workflow: Query Parser → Parallel Analysis → Risk → End.
+
+    Used for batch runs, where the synthesis step is submitted separately
+    (e.g. through the Gemini Batch API) instead of being called per graph run.
+    As in the full workflow, a run where every analysis agent failed ends with
+    the insufficient-data WAIT decision, so it needs no synthesis.
+
+    Returns:
+        Compiled StateGraph application
+    """
+    workflow = StateGraph(ForexAgentState)
+
+    workflow.add_node("query_parser", query_parser_node)
+    workflow.add_node("parallel_analysis", parallel_analysis_node)
+    workflow.add_node("risk", risk_node)
+    workflow.add_node("insufficient_data", insufficient_data_node)
+
+    workflow.set_entry_point("query_parser")
+    workflow.add_edge("query_parser", "parallel_analysis")
+    workflow.add_edge("parallel_analysis", "risk")
+    workflow.add_conditional_edges(
+        "risk",
+        should_continue_after_risk,
+        {
+            "continue": END,  # Synthesis is submitted by the caller
+            "insufficient_data": "insufficient_data",
+            "end": END,
+        },
+    )
+    workflow.add_edge("insufficient_data", END)
+
+    return workflow.compile()
+
+
 def visualize_workflow(app=None):
     """
     Visualize the workflow graph.
@@ -121,7 +163,7 @@ def visualize_workflow(app=None):
         print("    └─ fundamental_node")
         print("    ↓")
         print("  risk_node (advisory only)")
-        print("    ↓")
+        print("    ↓  (insufficient_data_node → END if all agents failed)")
         print("  synthesis_node")
         print("    ↓")
         print("  report_node")
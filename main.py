@@ -1,18 +1,85 @@
 """Main entry point for Forex Agent System."""
 
+import asyncio
+import io
 import sys
+import traceback
+from typing import Any, Dict
 from system import ForexAgentSystem
+from utils.gemini import aclose_async_clients
+from utils.logger import enable_queue_logging
+
+# Rule framing each section of the CLI output
+_BANNER = "=" * 60
+
+
+def _write_result(out: io.StringIO, result: Dict[str, Any]):
+    """Write the detailed results of one analysis to the output buffer."""
+    out.write(f"\n{_BANNER}\n📊 DETAILED RESULTS\n{_BANNER}\n")
+
+    # Query context
+    query_ctx = result.get("query_context", {})
+    if query_ctx:
+        out.write("\n🔍 Query Understanding:\n")
+        out.write(f"   Original: '{result['user_query']}'\n")
+        out.write(f"   Parsed Pair: {query_ctx.get('pair', 'N/A')}\n")
+        out.write(f"   Asset Type: {query_ctx.get('asset_type', 'N/A')}\n")
+        out.write(f"   Timeframe: {query_ctx.get('timeframe', 'N/A')}\n")
+        out.write(f"   Intent: {query_ctx.get('user_intent', 'N/A')}\n")
+
+    # Agent summaries
+    for label, key in (
+        ("📰 News Agent", "news"),
+        ("📊 Technical Agent", "technical"),
+        ("💰 Fundamental Agent", "fundamental"),
+        ("⚖️  Risk Agent", "risk"),
+    ):
+        out.write(f"\n{label}:\n")
+        agent_result = result["agent_results"][key]
+        if agent_result and agent_result.get("success"):
+            out.write(f"   {agent_result['data'].get('summary', 'N/A')}\n")
+        else:
+            out.write(f"   ❌ Error: {agent_result.get('error', 'Unknown error')}\n")
+
+
+# Maximum queries analyzed at once in --batch mode (keeps Gemini rate limits in check)
+_BATCH_CONCURRENCY = 4
+
+
+async def _analyze_concurrently(system: ForexAgentSystem, queries):
+    """Run several queries through the workflow at once."""
+    semaphore = asyncio.Semaphore(_BATCH_CONCURRENCY)
+
+    async def run(query):
+        async with semaphore:
+            return await system.aanalyze(query, verbose=False)
+
+    try:
+        return await asyncio.gather(*(run(query) for query in queries))
+    finally:
+        # Release this loop's Gemini connections before asyncio.run() closes it
+        await aclose_async_clients()
 
 
 def main():
-    """Run forex analysis with natural language query."""
-    # Default query
-    query = "EUR/USD"
+    """
+    Run forex analysis with natural language query.
 
-    # Check if query provided as command line argument
-    if len(sys.argv) > 1:
+    Usage:
+        python main.py Analyze gold trading        # one (multi-word) query
+        python main.py --batch EUR/USD XAU/USD     # several queries, run concurrently
+    """
+    # Write node/agent logs from a background thread rather than the event loop
+    enable_queue_logging()
+
+    # Default query
+    args = sys.argv[1:]
+    batch = bool(args) and args[0] == "--batch"
+    if batch:
+        queries = args[1:] or ["EUR/USD"]
+    else:
         # Join all arguments to support multi-word queries
-        query = " ".join(sys.argv[1:])
+        queries = [" ".join(args) if args else "EUR/USD"]
 
     try:
         # Initialize system
@@ -20,58 +87,23 @@ def main():
         system = ForexAgentSystem()
 
         # Run analysis with natural language
-        result = system.analyze(query)
-
-        # Print detailed results
-        print("\n" + "=" * 60)
-        print("📊 DETAILED RESULTS")
-        print("=" * 60)
-
-        # Query context
-        query_ctx = result.get("query_context", {})
-        if query_ctx:
-            print(f"\n🔍 Query Understanding:")
-            print(f"   Original: '{result['user_query']}'")
-            print(f"   Parsed Pair: {query_ctx.get('pair', 'N/A')}")
-            print(f"   Asset Type: {query_ctx.get('asset_type', 'N/A')}")
-            print(f"   Timeframe: {query_ctx.get('timeframe', 'N/A')}")
-            print(f"   Intent: {query_ctx.get('user_intent', 'N/A')}")
-
-        # Agent summaries
-        print("\n📰 News Agent:")
-        news = result["agent_results"]["news"]
-        if news and news.get("success"):
-            print(f"   {news['data'].get('summary', 'N/A')}")
-        else:
-            print(f"   ❌ Error: {news.get('error', 'Unknown error')}")
-
-        print("\n📊 Technical Agent:")
-        tech = result["agent_results"]["technical"]
-        if tech and tech.get("success"):
-            print(f"   {tech['data'].get('summary', 'N/A')}")
+        if batch:
+            results = asyncio.run(_analyze_concurrently(system, queries))
         else:
-            print(f"   ❌ Error: {tech.get('error', 'Unknown error')}")
+            results = [system.analyze(queries[0])]
 
-        print("\n💰 Fundamental Agent:")
-        fund = result["agent_results"]["fundamental"]
-        if fund and fund.get("success"):
-            print(f"   {fund['data'].get('summary', 'N/A')}")
-        else:
-            print(f"   ❌ Error: {fund.get('error', 'Unknown error')}")
-
-        print("\n⚖️  Risk Agent:")
-        risk = result["agent_results"]["risk"]
-        if risk and risk.get("success"):
-            print(f"   {risk['data'].get('summary', 'N/A')}")
-        else:
-            print(f"   ❌ Error: {risk.get('error', 'Unknown error')}")
+        # Collect the detailed results and write them in one go
+        out = io.StringIO()
+        for result in results:
+            _write_result(out, result)
 
-        print("\n" + "=" * 60)
-        print("✅ Analysis complete!")
-        print("\n💡 Try these queries:")
-        print("   python main.py 'Analyze gold trading'")
-        print("   python main.py 'Should I buy Bitcoin?'")
-        print("   python main.py 'GBP/USD long term outlook'")
+        out.write(f"\n{_BANNER}\n✅ Analysis complete!\n")
+        out.write("\n💡 Try these queries:\n")
+        out.write("   python main.py 'Analyze gold trading'\n")
+        out.write("   python main.py 'Should I buy Bitcoin?'\n")
+        out.write("   python main.py 'GBP/USD long term outlook'\n")
+        out.write("   python main.py --batch EUR/USD XAU/USD BTC/USD\n")
+        sys.stdout.write(out.getvalue())
 
     except ValueError as e:
         print(f"\n❌ Configuration Error: {e}")
@@ -81,8 +113,6 @@ def main():
 
     except Exception as e:
         print(f"\n❌ Error: {e}")
-        import traceback
-
         traceback.print_exc()
         sys.exit(1)
 
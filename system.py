@@ -1,10 +1,74 @@
 """Forex Agent System - Main orchestrator using LangGraph."""
 
 import os
-from typing import Dict, Any, Optional
-from dotenv import load_dotenv
-
-from graph.workflow import build_forex_workflow, visualize_workflow, get_workflow_info
+import sys
+import asyncio
+import json
+from operator import itemgetter
+from typing import Dict, Any, List, Optional
+
+from graph.workflow import build_forex_workflow, build_analysis_workflow, visualize_workflow, get_workflow_info
+from graph.nodes import SYNTHESIS_BATCH_CONFIG, _build_synthesis_prompt
+from graph.state import merge_errors
+from utils.env import load_env
+from utils.gemini import aclose_async_clients, batch_generate, get_client
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+# Rule framing the verbose query header and decision block
+_BANNER = "=" * 60
+
+# Emoji shown next to each decision action in the verbose printout
+_ACTION_EMOJI = {"BUY": "🟢", "SELL": "🔴", "WAIT": "🟡"}
+
+
+# State keys read by _format_result, fetched in one C-level call per result
+_RESULT_KEYS = (
+    "user_query", "query_context", "pair", "decision", "report_result",
+    "news_result", "technical_result", "fundamental_result", "risk_result",
+    "step_count", "errors",
+)
+_RESULT_FIELDS = itemgetter(*_RESULT_KEYS)
+_RESULT_DEFAULTS = {**dict.fromkeys(_RESULT_KEYS), "step_count": 0}
+
+
+# Per-run state before any node runs; _initial_state() copies it and fills in
+# the query, a fresh messages list and the account settings
+_INITIAL_STATE_TEMPLATE = {
+    "user_query": None,
+    "query_context": None,
+    "pair": None,  # Will be set by query parser
+    "messages": None,
+    "step_count": 0,
+    "news_result": None,
+    "technical_result": None,
+    "fundamental_result": None,
+    "risk_result": None,
+    "decision": None,
+    "report_result": None,
+    "should_continue": True,
+    "errors": None,
+    "account_balance": None,
+    "max_risk_per_trade": None,
+}
+
+
+def _run(coro):
+    """Run a coroutine with asyncio.run(), closing that loop's Gemini clients before it ends."""
+    async def main():
+        try:
+            return await coro
+        finally:
+            await aclose_async_clients()
+
+    return asyncio.run(main())
+
+
+def _run_config(run_name: str) -> Dict[str, Any]:
+    """Runnable config naming and tagging a non-streaming run for traces."""
+    return {"run_name": run_name, "tags": ["forex-agent", "non-streaming"]}
 
 
 class ForexAgentSystem:
@@ -38,19 +102,16 @@ class ForexAgentSystem:
             max_risk_per_trade: Max risk per trade as decimal (default: from env or 0.02)
             api_key: Google AI API key (default: from env)
         """
-        # Load environment variables
-        load_dotenv()
-
-        # Set account parameters
-        if account_balance is not None:
-            os.environ["ACCOUNT_BALANCE"] = str(account_balance)
-        elif "ACCOUNT_BALANCE" not in os.environ:
-            os.environ["ACCOUNT_BALANCE"] = "10000.0"
+        # Load environment variables (a no-op after the first load in this process)
+        load_env()
 
-        if max_risk_per_trade is not None:
-            os.environ["MAX_RISK_PER_TRADE"] = str(max_risk_per_trade)
-        elif "MAX_RISK_PER_TRADE" not in os.environ:
-            os.environ["MAX_RISK_PER_TRADE"] = "0.02"
+        # Per-instance account settings, parsed once (threaded into each run's state)
+        if account_balance is None:
+            account_balance = os.getenv("ACCOUNT_BALANCE", "10000.0")
+        if max_risk_per_trade is None:
+            max_risk_per_trade = os.getenv("MAX_RISK_PER_TRADE", "0.02")
+        self.account_balance = float(account_balance)
+        self.max_risk_per_trade = float(max_risk_per_trade)
 
         # Set API key
         if api_key is not None:
@@ -64,16 +125,27 @@ class ForexAgentSystem:
                 "Get your key from: https://aistudio.google.com/app/apikey"
             )
 
+        # Run tracing/callback handlers in the background rather than blocking node execution
+        # (LangChain's default outside serverless; set explicitly so an env override is deliberate)
+        os.environ.setdefault("LANGCHAIN_CALLBACKS_BACKGROUND", "true")
+
         # Build workflow
         self.app = build_forex_workflow()
 
-        print("✅ Forex Agent System initialized")
-        print(f"   Account Balance: ${os.getenv('ACCOUNT_BALANCE')}")
-        print(f"   Max Risk Per Trade: {float(os.getenv('MAX_RISK_PER_TRADE'))*100}%")
+        # Graph topology is fixed once compiled; described on first get_info()
+        self._workflow_info = None
+
+        logger.info(
+            "✅ Forex Agent System initialized (balance: $%s, max risk per trade: %s%%)",
+            self.account_balance,
+            self.max_risk_per_trade * 100,
+        )
 
     def analyze(self, query: str, verbose: bool = True) -> Dict[str, Any]:
         """
-        Analyze a trading query and make a decision.
+        Analyze a trading query and make a decision (blocking wrapper around aanalyze).
+
+        Must not be called from a running event loop; use ``await aanalyze()`` there.
 
         NEW: Now accepts natural language queries!
         - "Analyze gold trading"
@@ -102,43 +174,119 @@ class ForexAgentSystem:
             >>> print(result["decision"]["action"])  # BUY, SELL, or WAIT
             >>> print(result["query_context"]["pair"])  # XAU/USD
         """
+        return _run(self.aanalyze(query, verbose=verbose))
+
+    async def aanalyze(self, query: str, verbose: bool = True) -> Dict[str, Any]:
+        """
+        Analyze a trading query and make a decision (async).
+
+        Same as analyze(), but drives the graph with astream so the caller's
+        event loop stays free; several queries can run concurrently with
+        asyncio.gather.
+
+        Args:
+            query: Natural language query or currency pair
+            verbose: Print progress messages (default: True)
+
+        Returns:
+            Dict with final decision and all agent results
+        """
         if verbose:
-            print(f"\n{'='*60}")
-            print(f"🔍 QUERY: {query}")
-            print(f"{'='*60}\n")
+            sys.stdout.write(f"\n{_BANNER}\n🔍 QUERY: {query}\n{_BANNER}\n\n")
 
         # Prepare initial state with natural language query
-        inputs = {
-            "user_query": query,
-            "query_context": None,
-            "pair": None,  # Will be set by query parser
-            "messages": [],
-            "step_count": 0,
-            "news_result": None,
-            "technical_result": None,
-            "fundamental_result": None,
-            "risk_result": None,
-            "decision": None,
-            "report_result": None,
-            "should_continue": True,
-            "errors": None,
-        }
-
-        # Stream execution through the graph
-        final_state = None
-        for state in self.app.stream(inputs, stream_mode="values"):
-            final_state = state
-            if verbose:
-                step = state.get("step_count", 0)
-                print(f"   Step {step} completed")
+        inputs = self._initial_state(query)
+
+        # Stream per-node updates and fold them into one local state dict
+        # (cheaper than receiving a full state snapshot after every node)
+        final_state = dict(inputs)
+        async for update in self.app.astream(inputs, config=_run_config("forex_analysis"), stream_mode="updates"):
+            for delta in update.values():
+                if not delta:
+                    continue
+                errors = merge_errors(final_state.get("errors"), delta.get("errors"))
+                final_state.update(delta)
+                final_state["errors"] = errors
+                if verbose:
+                    logger.info("Step %s completed", final_state.get("step_count", 0))
 
         if verbose:
-            print(f"\n{'='*60}")
-            self._print_decision(final_state)
-            print(f"{'='*60}\n")
+            lines = [f"\n{_BANNER}", *self._decision_lines(final_state), f"{_BANNER}\n"]
+            sys.stdout.write("\n".join(lines) + "\n")
 
         return self._format_result(final_state)
 
+    def analyze_batch(self, queries: List[str], poll_interval: float = 30.0) -> List[Dict[str, Any]]:
+        """
+        Analyze several queries, with synthesis submitted as one Gemini batch job.
+
+        Parsing, agent analysis and risk run for all queries concurrently; the
+        synthesis prompts are then sent through the Gemini Batch API (half the
+        cost of interactive calls, but results can take minutes). Intended for
+        non-interactive sweeps such as nightly reports. Reports are not generated.
+
+        Args:
+            queries: Natural language queries or currency pairs
+            poll_interval: Seconds between batch job status checks
+
+        Returns:
+            One result per query (same shape as analyze()), in input order
+        """
+        if not queries:
+            return []
+
+        analysis_app = build_analysis_workflow()
+
+        async def run_all():
+            return await asyncio.gather(*(analysis_app.ainvoke(self._initial_state(q), config=_run_config("forex_batch_analysis")) for q in queries))
+
+        states = _run(run_all())
+
+        # Runs where every agent failed already carry the insufficient-data WAIT decision;
+        # only the rest are synthesized. Request keys are list indices, so repeated pairs stay distinct
+        prompts = {str(i): _build_synthesis_prompt(state) for i, state in enumerate(states) if not state.get("decision")}
+        responses = {}
+        if prompts:
+            api_key = os.getenv("GOOGLE_AI_API_KEY")
+            if not api_key:
+                raise ValueError("GOOGLE_AI_API_KEY not found")
+            responses = batch_generate(
+                get_client(api_key),
+                prompts,
+                SYNTHESIS_BATCH_CONFIG,
+                display_name=f"forex-synthesis-{len(prompts)}",
+                poll_interval=poll_interval,
+            )
+
+        results = []
+        for i, state in enumerate(states):
+            if state.get("decision"):
+                results.append(self._format_result(state))
+                continue
+
+            text = responses.get(str(i))
+            try:
+                if text is None:
+                    raise ValueError("No response from batch job")
+                decision = json.loads(text)
+            except ValueError as e:
+                decision = {
+                    "action": "WAIT",
+                    "confidence": 0.0,
+                    "reasoning": {"summary": f"Synthesis failed: {str(e)}", "error": True},
+                }
+            results.append(self._format_result({**state, "decision": decision, "step_count": state["step_count"] + 1}))
+        return results
+
+    def _initial_state(self, query: str) -> Dict[str, Any]:
+        """Initial graph state for a natural language query."""
+        state = _INITIAL_STATE_TEMPLATE.copy()
+        state["user_query"] = query
+        state["messages"] = []  # Fresh list per run
+        state["account_balance"] = self.account_balance
+        state["max_risk_per_trade"] = self.max_risk_per_trade
+        return state
+
     def visualize(self):
         """
         Visualize the workflow graph.
@@ -154,12 +302,14 @@ class ForexAgentSystem:
         Returns:
             Dict with system information
         """
-        workflow_info = get_workflow_info(self.app)
+        if self._workflow_info is None:
+            self._workflow_info = get_workflow_info(self.app)
+        workflow_info = self._workflow_info
 
         return {
             "system": {
-                "account_balance": float(os.getenv("ACCOUNT_BALANCE", 10000)),
-                "max_risk_per_trade": float(os.getenv("MAX_RISK_PER_TRADE", 0.02)),
+                "account_balance": self.account_balance,
+                "max_risk_per_trade": self.max_risk_per_trade,
                 "api_configured": bool(os.getenv("GOOGLE_AI_API_KEY")),
             },
             "workflow": workflow_info,
@@ -167,85 +317,98 @@ class ForexAgentSystem:
 
     def _format_result(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """Format the final state into a structured result."""
-        decision = state.get("decision", {})
+        try:
+            (
+                user_query, query_context, pair, decision, report_result,
+                news_result, technical_result, fundamental_result, risk_result,
+                step_count, errors,
+            ) = _RESULT_FIELDS(state)
+        except KeyError:
+            # Partial state (not started from _initial_state): fill the absent keys
+            return self._format_result({**_RESULT_DEFAULTS, "decision": {}, **state})
 
         # Handle case where workflow ended early (risk rejected)
         if not decision:
-            risk_result = state.get("risk_result", {})
-            if risk_result.get("data", {}).get("trade_approved") == False:
+            risk_data = (risk_result or {}).get("data") or {}
+            if risk_data.get("trade_approved") == False:
                 decision = {
                     "action": "WAIT",
                     "confidence": 0.0,
                     "reasoning": {
-                        "summary": f"Trade rejected by Risk Agent: {risk_result['data'].get('rejection_reason')}",
+                        "summary": f"Trade rejected by Risk Agent: {risk_data.get('rejection_reason')}",
                         "risk_rejection": True,
                     },
                 }
 
         return {
-            "user_query": state.get("user_query"),
-            "query_context": state.get("query_context"),
-            "pair": state.get("pair"),
+            "user_query": user_query,
+            "query_context": query_context,
+            "pair": pair,
             "decision": decision,
-            "report": state.get("report_result"),
+            "report": report_result,
             "agent_results": {
-                "news": state.get("news_result"),
-                "technical": state.get("technical_result"),
-                "fundamental": state.get("fundamental_result"),
-                "risk": state.get("risk_result"),
+                "news": news_result,
+                "technical": technical_result,
+                "fundamental": fundamental_result,
+                "risk": risk_result,
             },
             "metadata": {
-                "steps": state.get("step_count", 0),
-                "errors": state.get("errors"),
+                "steps": step_count,
+                "errors": errors,
             },
         }
 
     def _print_decision(self, state: Dict[str, Any]):
         """Print the final decision in a readable format."""
-        decision = state.get("decision", {})
+        sys.stdout.write("\n".join(self._decision_lines(state)) + "\n")
+
+    def _decision_lines(self, state: Dict[str, Any]) -> List[str]:
+        """Lines of the readable final decision (written in one go by the callers)."""
+        decision = state.get("decision")
+        lines = []
 
         if not decision:
-            print("⚠️  No decision made (workflow ended early)")
-            risk_result = state.get("risk_result", {})
-            if risk_result.get("data", {}).get("trade_approved") == False:
-                print(f"   Reason: {risk_result['data'].get('rejection_reason')}")
-            return
+            lines.append("⚠️  No decision made (workflow ended early)")
+            risk_data = (state.get("risk_result") or {}).get("data") or {}
+            if risk_data.get("trade_approved") == False:
+                lines.append(f"   Reason: {risk_data.get('rejection_reason')}")
+            return lines
 
         action = decision.get("action", "UNKNOWN")
         confidence = decision.get("confidence", 0.0)
 
-        # Print action with emoji
-        action_emoji = {"BUY": "🟢", "SELL": "🔴", "WAIT": "🟡"}.get(action, "❓")
+        # Action with emoji
+        action_emoji = _ACTION_EMOJI.get(action, "❓")
 
-        print(f"{action_emoji} DECISION: {action}")
-        print(f"   Confidence: {confidence:.0%}")
+        lines.append(f"{action_emoji} DECISION: {action}")
+        lines.append(f"   Confidence: {confidence:.0%}")
 
-        # Print reasoning
-        reasoning = decision.get("reasoning", {})
-        if "summary" in reasoning:
-            print(f"\n   Summary: {reasoning['summary']}")
+        # Reasoning
+        reasoning = decision.get("reasoning") or {}
+        if (summary := reasoning.get("summary")) is not None:
+            lines.append(f"\n   Summary: {summary}")
 
-        # Print key factors
-        if "key_factors" in reasoning:
-            print(f"\n   Key Factors:")
-            for factor in reasoning["key_factors"]:
-                print(f"     • {factor}")
+        # Key factors
+        if (key_factors := reasoning.get("key_factors")) is not None:
+            lines.append("\n   Key Factors:")
+            lines.extend(f"     • {factor}" for factor in key_factors)
 
-        # Print trade parameters (if BUY/SELL)
-        if action in ["BUY", "SELL"]:
-            params = decision.get("trade_parameters", {})
+        # Trade parameters (if BUY/SELL)
+        if action in ("BUY", "SELL"):
+            params = decision.get("trade_parameters")
             if params:
-                print(f"\n   Trade Parameters:")
-                print(f"     Entry: {params.get('entry_price', 'N/A')}")
-                print(f"     Stop Loss: {params.get('stop_loss', 'N/A')}")
-                print(f"     Take Profit: {params.get('take_profit', 'N/A')}")
-                print(f"     Position Size: {params.get('position_size', 'N/A')} lots")
-
-        # Print sources
-        grounding = decision.get("grounding_metadata", {})
-        sources = grounding.get("sources", [])
+                lines.append("\n   Trade Parameters:")
+                lines.append(f"     Entry: {params.get('entry_price', 'N/A')}")
+                lines.append(f"     Stop Loss: {params.get('stop_loss', 'N/A')}")
+                lines.append(f"     Take Profit: {params.get('take_profit', 'N/A')}")
+                lines.append(f"     Position Size: {params.get('position_size', 'N/A')} lots")
+
+        # Sources
+        sources = (decision.get("grounding_metadata") or {}).get("sources")
         if sources:
-            print(f"\n   🌐 Sources ({len(sources)}):")
+            lines.append(f"\n   🌐 Sources ({len(sources)}):")
             for i, source in enumerate(sources[:3], 1):  # Show first 3
-                print(f"     {i}. {source.get('title', 'Unknown')}")
-                print(f"        {source.get('url', 'No URL')}")
+                lines.append(f"     {i}. {source.get('title', 'Unknown')}")
+                lines.append(f"        {source.get('url', 'No URL')}")
+
+        return lines
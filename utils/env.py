@@ -0,0 +1,17 @@
+"""Environment loading shared across the forex agent system."""
+
+from functools import cache
+
+from dotenv import load_dotenv
+
+
+@cache
+def load_env() -> None:
+    """
+    Load variables from the project's .env file into os.environ, once per process.
+
+    Later calls are no-ops, so constructing many ForexAgentSystem instances
+    doesn't re-read and re-parse the file. Variables already set in the
+    environment take precedence over the file, as with load_dotenv().
+    """
+    load_dotenv()
@@ -0,0 +1,178 @@
+"""Shared Gemini client access for the forex agent system."""
+
+import asyncio
+import os
+import tempfile
+import time
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+import orjson
+
+
+# Per-request HTTP timeout for Gemini calls, in milliseconds
+_DEFAULT_TIMEOUT_MS = 30_000
+
+
+def _new_client(api_key: str):
+    """Build a Gemini client whose requests time out after GEMINI_TIMEOUT_MS."""
+    from google import genai
+    from google.genai import types
+
+    timeout_ms = int(os.getenv("GEMINI_TIMEOUT_MS", _DEFAULT_TIMEOUT_MS))
+    return genai.Client(api_key=api_key, http_options=types.HttpOptions(timeout=timeout_ms))
+
+
+@lru_cache(maxsize=4)
+def get_client(api_key: str):
+    """
+    Get a memoized Gemini client for synchronous calls with the given API key.
+
+    Building a client parses config and sets up the HTTP transport, so one
+    instance per key is reused across calls (and its connection pool with it).
+    Requests time out after GEMINI_TIMEOUT_MS (default 30s) instead of hanging
+    on a stalled connection. For ``client.aio`` calls use get_async_client().
+
+    Args:
+        api_key: Google AI API key
+
+    Returns:
+        google.genai.Client instance
+    """
+    return _new_client(api_key)
+
+
+# Clients for async calls, per event loop: the aio transport's connections belong to
+# the loop they were opened on, so a client must not outlive it. The clients reference
+# their loop, so entries are dropped explicitly once the loop is closed
+_ASYNC_CLIENTS: Dict[asyncio.AbstractEventLoop, Dict[str, Any]] = {}
+
+
+def get_async_client(api_key: str):
+    """
+    Get the Gemini client for ``client.aio`` calls on the running event loop.
+
+    The sync wrappers (ForexAgentSystem.analyze, analyze_batch) run each call
+    on a fresh loop via asyncio.run(); a client shared across loops would then
+    reuse pooled connections bound to a closed loop ("Event loop is closed").
+    One client is kept per (loop, key) instead, so calls on the same loop still
+    share a connection pool.
+
+    Args:
+        api_key: Google AI API key
+
+    Returns:
+        google.genai.Client instance
+
+    Raises:
+        RuntimeError: If called without a running event loop
+    """
+    loop = asyncio.get_running_loop()
+    clients = _ASYNC_CLIENTS.get(loop)
+    if clients is None:
+        # First use on this loop: forget clients of loops that have since closed
+        for closed in [other for other in _ASYNC_CLIENTS if other.is_closed()]:
+            del _ASYNC_CLIENTS[closed]
+        clients = _ASYNC_CLIENTS[loop] = {}
+    client = clients.get(api_key)
+    if client is None:
+        client = clients[api_key] = _new_client(api_key)
+    return client
+
+
+async def aclose_async_clients() -> None:
+    """
+    Close and forget the running loop's async Gemini clients.
+
+    Call before a short-lived loop (e.g. one made by asyncio.run()) ends, so
+    the clients release their connections on the loop that opened them.
+    """
+    for client in _ASYNC_CLIENTS.pop(asyncio.get_running_loop(), {}).values():
+        await client.aio.aclose()
+
+
+# Batch jobs in these states will not make further progress
+_TERMINAL_BATCH_STATES = frozenset({
+    "JOB_STATE_SUCCEEDED",
+    "JOB_STATE_PARTIALLY_SUCCEEDED",
+    "JOB_STATE_FAILED",
+    "JOB_STATE_CANCELLED",
+    "JOB_STATE_EXPIRED",
+})
+
+
+def batch_generate(
+    client,
+    prompts: Dict[str, str],
+    generation_config: Dict[str, Any],
+    model: str = "gemini-2.5-flash",
+    display_name: str = "forex-agent-batch",
+    poll_interval: float = 30.0,
+) -> Dict[str, Optional[str]]:
+    """
+    Run prompts through the Gemini Batch API and wait for the results.
+
+    Batch jobs are billed at half the interactive rate and don't count against
+    interactive rate limits, at the cost of minutes-to-hours turnaround. Use
+    for non-interactive sweeps only.
+
+    Args:
+        client: google.genai.Client (e.g. from get_client())
+        prompts: Prompt text by request key (keys are echoed back in results)
+        generation_config: REST-style generation config applied to every request
+        model: Model name
+        display_name: Display name of the batch job
+        poll_interval: Seconds between job status checks
+
+    Returns:
+        Response text by request key (None for requests that failed)
+
+    Raises:
+        RuntimeError: If the batch job does not succeed
+    """
+    # JSONL input file: one {"key", "request"} object per prompt
+    with tempfile.NamedTemporaryFile("wb", suffix=".jsonl", delete=False) as f:
+        for key, prompt in prompts.items():
+            f.write(orjson.dumps({
+                "key": key,
+                "request": {
+                    "contents": [{"parts": [{"text": prompt}]}],
+                    "generation_config": generation_config,
+                },
+            }))
+            f.write(b"\n")
+        path = f.name
+
+    try:
+        uploaded = client.files.upload(
+            file=path,
+            config={"display_name": display_name, "mime_type": "jsonl"},
+        )
+    finally:
+        os.remove(path)
+
+    batch_job = client.batches.create(
+        model=model,
+        src=uploaded.name,
+        config={"display_name": display_name},
+    )
+
+    while batch_job.state.name not in _TERMINAL_BATCH_STATES:
+        time.sleep(poll_interval)
+        batch_job = client.batches.get(name=batch_job.name)
+
+    if batch_job.state.name not in ("JOB_STATE_SUCCEEDED", "JOB_STATE_PARTIALLY_SUCCEEDED"):
+        raise RuntimeError(f"Gemini batch job {batch_job.name} ended in {batch_job.state.name}")
+
+    results: Dict[str, Optional[str]] = dict.fromkeys(prompts)
+    for line in client.files.download(file=batch_job.dest.file_name).splitlines():
+        if not line.strip():
+            continue
+        item = orjson.loads(line)
+        try:
+            parts = item["response"]["candidates"][0]["content"]["parts"]
+            results[item["key"]] = "".join(part.get("text", "") for part in parts)
+        except (KeyError, IndexError, TypeError):
+            # Per-request failures carry an "error" object instead of a response
+            results[item.get("key")] = None
+    return results
@@ -0,0 +1,101 @@
+"""Exact-match response cache for JSON-mode Gemini calls."""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from hashlib import blake2b
+from typing import Any, Dict, Optional
+
+import orjson
+
+# Seconds a cached response stays valid; repeat prompts older than this go back to Gemini
+_DEFAULT_TTL = 300
+
+
+class _SQLiteBackend:
+    """Response texts in a SQLite file, so repeat prompts stay cached across runs."""
+
+    def __init__(self, path: str, ttl: float = _DEFAULT_TTL):
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS llm_cache (key TEXT PRIMARY KEY, text TEXT, created REAL)")
+        self._conn.commit()
+        self._ttl = ttl
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT text FROM llm_cache WHERE key = ? AND created > ?", (key, time.time() - self._ttl)
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, text: str):
+        now = time.time()
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO llm_cache VALUES (?, ?, ?)", (key, text, now))
+            # Expired rows are never read again; drop them so the file doesn't grow forever
+            self._conn.execute("DELETE FROM llm_cache WHERE created <= ?", (now - self._ttl,))
+            self._conn.commit()
+
+
+@lru_cache(maxsize=1)
+def get_llm_cache():
+    """
+    Get the process-wide LLM response cache selected by the environment.
+
+    The cache is opt-in: LLM_CACHE="sqlite" stores responses in the file at
+    LLM_CACHE_DB (default .forex_llm.db) for LLM_CACHE_TTL seconds (default
+    300), so repeat prompts are reused across runs. Anything else, including
+    the default "off", disables it; within one process the query parser's own
+    result cache already answers repeat queries.
+
+    Returns:
+        Cache backend with get(key)/set(key, text), or None when disabled
+    """
+    if os.getenv("LLM_CACHE", "off").lower() != "sqlite":
+        return None
+    ttl = float(os.getenv("LLM_CACHE_TTL") or _DEFAULT_TTL)
+    return _SQLiteBackend(os.getenv("LLM_CACHE_DB", ".forex_llm.db"), ttl=ttl)
+
+
+def _cache_key(model: str, prompt: str, config) -> str:
+    """Stable hash of everything that determines a generation."""
+    config_data = config.model_dump(mode="json", exclude_none=True) if config is not None else None
+    return blake2b(orjson.dumps([model, prompt, config_data], option=orjson.OPT_SORT_KEYS), digest_size=16).hexdigest()
+
+
+def generate_json(client, model: str, prompt: str, config) -> Dict[str, Any]:
+    """
+    Generate and parse a JSON response, reusing the cached text for a repeated prompt.
+
+    Only responses that parse are cached, so a malformed reply is retried next time.
+    Use it for deterministic prompts only (the query parser): a cached reply is
+    replayed verbatim, which is wrong for anything that depends on market data.
+
+    Args:
+        client: google.genai.Client
+        model: Model name
+        prompt: Prompt text
+        config: GenerateContentConfig (part of the cache key)
+
+    Returns:
+        Parsed JSON response
+
+    Raises:
+        ValueError: If the response is not valid JSON
+    """
+    cache = get_llm_cache()
+    key = _cache_key(model, prompt, config)
+    text = cache.get(key) if cache is not None else None
+    if text is not None:
+        return json.loads(text)
+
+    response = client.models.generate_content(model=model, contents=[prompt], config=config)
+    result = json.loads(response.text)
+    if cache is not None:
+        cache.set(key, response.text)
+    return result
+
@@ -1,16 +1,62 @@
 """Logging configuration for the forex agent system."""
 
+import atexit
 import logging
+import logging.handlers
+import os
+import queue
 import sys
 from typing import Optional
 
-# Global log level configuration
-LOG_LEVEL = logging.INFO
+from utils.env import load_env
+
+# Global log level configuration (LOG_LEVEL env var or .env entry, e.g. "WARNING" in production)
+load_env()
+LOG_LEVEL = logging.getLevelName(os.getenv("LOG_LEVEL", "INFO").upper())
+if not isinstance(LOG_LEVEL, int):
+    LOG_LEVEL = logging.INFO
 
 # Format with timestamp, level, filename, line number, and message
 LOG_FORMAT = "%(asctime)s | %(levelname)-8s | %(name)s:%(lineno)d | %(message)s"
 DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
 
+# Shared queue handler once enable_queue_logging() has run (None = log directly to stdout)
+_QUEUE_HANDLER: Optional[logging.handlers.QueueHandler] = None
+# Names of loggers whose console handler get_logger() installed
+_CONFIGURED_LOGGERS = set()
+
+
+def _console_handler(level: int) -> logging.Handler:
+    """Stdout handler with the standard format."""
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setLevel(level)
+    console_handler.setFormatter(logging.Formatter(LOG_FORMAT, datefmt=DATE_FORMAT))
+    return console_handler
+
+
+def enable_queue_logging() -> None:
+    """
+    Route all forex agent loggers through a queue drained on a background thread.
+
+    Log calls then only enqueue the record, so stdout writes (and the stream
+    lock) stay off the event loop thread while agents run concurrently.
+    Loggers created before and after this call are both switched over.
+    Calling it again is a no-op.
+    """
+    global _QUEUE_HANDLER
+    if _QUEUE_HANDLER is not None:
+        return
+
+    log_queue: queue.Queue = queue.Queue(-1)
+    listener = logging.handlers.QueueListener(log_queue, _console_handler(logging.DEBUG), respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    _QUEUE_HANDLER = logging.handlers.QueueHandler(log_queue)
+
+    # Swap the stdout handlers of loggers that get_logger() already configured
+    for name in _CONFIGURED_LOGGERS:
+        logging.getLogger(name).handlers = [_QUEUE_HANDLER]
+
 
 def get_logger(name: str, level: Optional[int] = None) -> logging.Logger:
     """
@@ -30,16 +76,9 @@ def get_logger(name: str, level: Optional[int] = None) -> logging.Logger:
 
     # Avoid adding handlers multiple times
     if not logger.handlers:
-        # Console handler
-        console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setLevel(level or LOG_LEVEL)
-
-        # Formatter
-        formatter = logging.Formatter(LOG_FORMAT, datefmt=DATE_FORMAT)
-        console_handler.setFormatter(formatter)
-
-        # Add handler to logger
-        logger.addHandler(console_handler)
+        # Console handler (through the background queue if enabled); the logger's level filters records
+        logger.addHandler(_QUEUE_HANDLER or _console_handler(level or LOG_LEVEL))
+        _CONFIGURED_LOGGERS.add(name)
 
     return logger
 
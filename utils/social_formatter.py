@@ -7,6 +7,9 @@ Supports Twitter, Telegram, and Facebook with professional FX trader voice.
 
 from typing import Dict, Any, Optional
 
+# Emoji heading Telegram/Facebook posts for each action
+_ACTION_EMOJI = {"BUY": "🟢", "SELL": "🔴", "WAIT": "⏸️"}
+
 
 def format_for_twitter(
     result: Dict[str, Any],
@@ -101,8 +104,7 @@ def format_for_telegram(
     confidence = f"{confidence_pct:.0%}" if isinstance(confidence_pct, (int, float)) else str(confidence_pct)
 
     # Header
-    emoji_map = {"BUY": "🟢", "SELL": "🔴", "WAIT": "⏸️"}
-    emoji = emoji_map.get(action, "📊")
+    emoji = _ACTION_EMOJI.get(action, "📊")
 
     post = f"{emoji} **{pair} - {action} Signal**\n\n"
 
@@ -182,8 +184,7 @@ def format_for_facebook(
     reasoning = reasoning_data.get('summary', '') if isinstance(reasoning_data, dict) else str(reasoning_data)
 
     # Friendly opening
-    emoji_map = {"BUY": "🟢", "SELL": "🔴", "WAIT": "⏸️"}
-    emoji = emoji_map.get(action, "📊")
+    emoji = _ACTION_EMOJI.get(action, "📊")
 
     is_signal = action in ['BUY', 'SELL'] and include_trade_params
 
@@ -0,0 +1,24 @@
+"""Stream writer helpers for agents that may run inside or outside a LangGraph run."""
+
+
+def _noop_writer(chunk) -> None:
+    """Discard custom stream events when no graph run is active."""
+
+
+def get_writer():
+    """
+    Get the LangGraph custom stream writer for the current run.
+
+    Agents emit progress events through this writer. When an agent is called
+    directly (e.g. from agents.orchestrator or a script) there is no runnable
+    context, so a no-op writer is returned instead of raising.
+
+    Returns:
+        Callable accepting a JSON-serializable event dict
+    """
+    from langgraph.config import get_stream_writer
+
+    try:
+        return get_stream_writer()
+    except RuntimeError:
+        return _noop_writer
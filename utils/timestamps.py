@@ -0,0 +1,68 @@
+"""Timestamp helpers shared across the forex agent system."""
+
+import copy
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict
+
+_UTC = timezone.utc
+
+
+def utc_isoformat() -> str:
+    """
+    Get the current UTC time as an ISO-8601 string without a UTC offset.
+
+    Produces the same format as the deprecated ``datetime.utcnow().isoformat()``
+    so existing consumers (and call sites appending "Z") keep working.
+
+    Returns:
+        ISO timestamp, e.g. "2025-11-05T14:30:00.123456"
+    """
+    return datetime.now(_UTC).replace(tzinfo=None).isoformat()
+
+
+# (epoch second, ISO string) of the last coarse timestamp; swapped atomically
+_COARSE_TIMESTAMP = (None, "")
+
+
+def utc_isoformat_coarse() -> str:
+    """
+    Get the current UTC time as an ISO-8601 string at one-second resolution.
+
+    The formatted string is cached for the current second, so rapid-fire
+    callers (streaming, batch analysis) share one formatting pass per second.
+
+    Returns:
+        ISO timestamp without fractional seconds, e.g. "2025-11-05T14:30:00"
+    """
+    global _COARSE_TIMESTAMP
+    now = int(time.time())
+    second, iso = _COARSE_TIMESTAMP
+    if second != now:
+        iso = datetime.fromtimestamp(now, _UTC).replace(tzinfo=None).isoformat()
+        _COARSE_TIMESTAMP = (now, iso)
+    return iso
+
+
+def replay_result(result: Dict[str, Any], start_time: float) -> Dict[str, Any]:
+    """
+    Copy a cached agent result with its execution timing set to the current run.
+
+    The copy is deep, so callers can't mutate the cached headlines, levels or
+    sources lists. ``analysis_timestamp`` is kept: it records when the cached
+    analysis was actually produced.
+
+    Args:
+        result: Cached agent result ({"success": ..., "data": {...}})
+        start_time: time.time() at the start of the current run
+
+    Returns:
+        Independent copy of the result with fresh execution timing
+    """
+    replay = copy.deepcopy(result)
+    data = replay.get("data")
+    if isinstance(data, dict):
+        data["execution_time"] = time.time() - start_time
+        data["execution_start_time"] = start_time
+        data["execution_end_time"] = utc_isoformat() + "Z"
+    return replay